@@ -1,12 +1,40 @@
 # BoundParams.py
 import json
 import os
+import re
 import logging
+import tempfile
+from functools import lru_cache
 from logger_config import bound_params_logger as logger
 
+# orjson 可选：解析多兆级的 .map.json 时比标准库快数倍，没装则回退到 json
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
 CACHE_DIR = ".emote_cache"
 CONFIG_FILE = "config.json"
 
+# 路径只在导入时解析一次，避免每次调用都重复 abspath/dirname 的系统调用
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+_CACHE_DIR_PATH = os.path.join(_SCRIPT_DIR, CACHE_DIR)
+_CONFIG_PATH = os.path.join(_SCRIPT_DIR, "config", CONFIG_FILE)
+
+def _load_json(path):
+    """整块读入后解析 JSON，优先走 orjson。"""
+    with open(path, "rb", buffering=1 << 16) as f:
+        data = f.read()
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
+
+def _dump_json_bytes(obj) -> bytes:
+    """把对象序列化成带缩进的 JSON 字节串，优先走 orjson。"""
+    if _orjson is not None:
+        return _orjson.dumps(obj, option=_orjson.OPT_INDENT_2 | _orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=4, ensure_ascii=False).encode("utf-8")
+
 class SpecialUsage:
     HEAD_LR = "HEAD_LR"
     HEAD_UD = "HEAD_UD"
@@ -23,46 +51,71 @@ def get_default_map():
 
 def _load_semantic_rules():
     """从 config.json 加载规则"""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    config_path = os.path.join(script_dir, "config", CONFIG_FILE)
-    
+    config_path = _CONFIG_PATH
+
     default_rules = [] # 如果文件不存在
     
     if not os.path.exists(config_path):
-        logger.warning(f"配置文件 {config_path} 不存在，将无法进行智能匹配。")
+        logger.warning("配置文件 %s 不存在，将无法进行智能匹配。", config_path)
         return default_rules
 
     try:
-        with open(config_path, "r", encoding="utf-8") as f:
-            config = json.load(f)
-            return config.get("semantic_rules", [])
+        config = _load_json(config_path)
+        return config.get("semantic_rules", [])
     except Exception as e:
-        logger.error(f"读取配置文件失败: {e}", exc_info=True)
+        logger.error("读取配置文件失败: %s", e, exc_info=True)
         return default_rules
 
+def _compile_keyword_matcher(rules):
+    """
+    把所有规则的关键字预编译成一个正则和关键字->规则反查表。
+    这样每个变量名只需一次 C 级扫描，而不是逐条规则、逐个关键字做子串匹配。
+    """
+    keyword_to_rule = {}
+    for rule in rules:
+        for kw in rule.get("keywords", []):
+            # 同一关键字出现在多条规则时，保持原先"先到先得"的优先级
+            keyword_to_rule.setdefault(kw.lower(), rule)
+
+    if not keyword_to_rule:
+        return keyword_to_rule, None
+
+    # 长关键字优先，避免 "head" 这类前缀吃掉 "head_lr" 的匹配
+    pattern = "|".join(
+        re.escape(kw) for kw in sorted(keyword_to_rule, key=len, reverse=True)
+    )
+    return keyword_to_rule, re.compile(pattern)
+
 # 加载规则
 SEMANTIC_RULES = _load_semantic_rules()
+_KEYWORD_TO_RULE, _KEYWORD_RE = _compile_keyword_matcher(SEMANTIC_RULES)
 
 def analyze_variable_list(raw_variable_list: list) -> dict:
     """
     基于 config.json 的规则进行分析
     """
     # 如果规则为空，尝试重新加载
-    global SEMANTIC_RULES
+    global SEMANTIC_RULES, _KEYWORD_TO_RULE, _KEYWORD_RE
     if not SEMANTIC_RULES:
         SEMANTIC_RULES = _load_semantic_rules()
+        _KEYWORD_TO_RULE, _KEYWORD_RE = _compile_keyword_matcher(SEMANTIC_RULES)
+
+    logger.info("开始分析 %d 个运行时变量...", len(raw_variable_list))
 
-    logger.info(f"开始分析 {len(raw_variable_list)} 个运行时变量...")
-    
     bound_map = {}
-    
+    _get = dict.get  # 绑定一次，省掉每个变量多次方法查找
+
     for var_info in raw_variable_list:
-        var_name = var_info.get('label')
+        var_name = _get(var_info, 'label')
         if not var_name: continue
-        
-        min_val = var_info.get('minValue', 0.0)
-        max_val = var_info.get('maxValue', 0.0)
-        frame_list = var_info.get('frameList', [])
+        if var_name in bound_map:
+            # 重复变量直接跳过，不重做整套帧/区间分析（原先是静默覆盖）
+            logger.debug("重复变量 '%s'，跳过重复分析。", var_name)
+            continue
+
+        min_val = _get(var_info, 'minValue', 0.0)
+        max_val = _get(var_info, 'maxValue', 0.0)
+        frame_list = _get(var_info, 'frameList', [])
         
         # 默认值
         category = "未分类"
@@ -70,32 +123,32 @@ def analyze_variable_list(raw_variable_list: list) -> dict:
         
         name_lower = var_name.lower()
         
-        for rule in SEMANTIC_RULES:
-            keywords = rule.get("keywords", [])
-            if any(kw in name_lower for kw in keywords):
-                category = rule.get("category", "未分类")
-                tag = rule.get("tag")
-                if tag:
-                    special_usage_list.append(tag)
-                break
-
-        semantic_frames = {}
-        if frame_list:
-            for frame in frame_list:
-                f_label = frame.get('label')
-                f_value = frame.get('value')
-                if f_label is not None and f_value is not None:
-                    semantic_frames[f_value] = f_label
+        match = _KEYWORD_RE.search(name_lower) if _KEYWORD_RE else None
+        if match:
+            rule = _KEYWORD_TO_RULE[match.group(0)]
+            category = rule.get("category", "未分类")
+            tag = rule.get("tag")
+            if tag:
+                special_usage_list.append(tag)
+
+        # 推导式让整个循环跑在 C 求值器里，空列表时直接给空字典
+        semantic_frames = {
+            frame['value']: frame['label']
+            for frame in frame_list
+            if frame.get('label') is not None and frame.get('value') is not None
+        } if frame_list else {}
 
         bound_map[var_name] = {
             "name": var_name,
-            "range": (float(min_val), float(max_val)),
+            # JSON 解析出来的多半已是 float，类型命中时省一次构造
+            "range": (min_val if type(min_val) is float else float(min_val),
+                      max_val if type(max_val) is float else float(max_val)),
             "category": category,
             "special_usage": special_usage_list,
             "semantic_frames": semantic_frames 
         }
         
-    logger.info(f"变量分析完成，生成了 {len(bound_map)} 个映射条目。")
+    logger.info("变量分析完成，生成了 %d 个映射条目。", len(bound_map))
     return bound_map
 
 def get_bound_map(model_path: str) -> dict:
@@ -104,36 +157,48 @@ def get_bound_map(model_path: str) -> dict:
         return get_default_map()
 
     model_filename = os.path.basename(model_path)
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    cache_file = os.path.join(script_dir, CACHE_DIR, f"{model_filename}.map.json")
+    cache_file = os.path.join(_CACHE_DIR_PATH, f"{model_filename}.map.json")
 
     if os.path.exists(cache_file):
         try:
-            with open(cache_file, "r", encoding="utf-8") as f:
-                logger.info(f"从缓存加载映射: {model_filename}")
-                return json.load(f)
+            logger.info("从缓存加载映射: %s", model_filename)
+            # 浅拷贝：调用方（如 Tester 的绑定面板）会整体替换条目，不能污染缓存
+            return dict(_load_cached_map(cache_file, os.path.getmtime(cache_file)))
         except Exception:
             pass
     
-    logger.info(f"无缓存，将在模型加载后通过运行时自省生成映射: {model_filename}")
+    logger.info("无缓存，将在模型加载后通过运行时自省生成映射: %s", model_filename)
     return get_default_map()
 
+@lru_cache(maxsize=32)
+def _load_cached_map(cache_file: str, mtime: float) -> dict:
+    """按 (路径, 修改时间) 缓存已解析的映射，同一模型反复查询时不再碰磁盘。"""
+    return _load_json(cache_file)
+
 def update_cache(model_filename: str, new_map: dict):
     """更新缓存"""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    cache_dir_path = os.path.join(script_dir, CACHE_DIR)
-    if not os.path.exists(cache_dir_path):
-        os.makedirs(cache_dir_path)
-        
+    os.makedirs(_CACHE_DIR_PATH, exist_ok=True)
+
     model_filename = os.path.basename(model_filename)
-    cache_file = os.path.join(cache_dir_path, f"{model_filename}.map.json")
+    cache_file = os.path.join(_CACHE_DIR_PATH, f"{model_filename}.map.json")
     
+    # 先写临时文件再原子替换，中途崩溃不会留下半截 JSON 让下次加载解析失败
+    fd, tmp_path = tempfile.mkstemp(
+        dir=_CACHE_DIR_PATH, prefix=f".{model_filename}.", suffix=".tmp"
+    )
     try:
-        with open(cache_file, "w", encoding="utf-8") as f:
-            json.dump(new_map, f, indent=4, ensure_ascii=False)
+        with os.fdopen(fd, "wb", buffering=1 << 16) as f:
+            f.write(_dump_json_bytes(new_map))
+        os.replace(tmp_path, cache_file)
+        # 旧的 mtime 键可能因文件系统时间精度而撞上新文件，直接清掉最稳妥
+        _load_cached_map.cache_clear()
         return True
     except Exception as e:
         logger.error("更新缓存失败", exc_info=True)
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
         return False
 
 load_map_from_cache = get_bound_map
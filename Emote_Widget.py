@@ -15,29 +15,77 @@
 __version__ = "0.0.1-A"
 
 import os
+import sys
 import json
+import math
 import time
 import queue
 import logging
 import threading
 import collections
+from functools import lru_cache
 import numpy as np
 import soundfile as sf
 import sounddevice as sd
-from PySide6.QtCore import Qt, QObject, Slot, Signal, QUrl, QThread, QPointF, QTimer
+from PySide6.QtCore import Qt, QObject, Slot, Signal, QUrl, QThread, QPointF, QTimer, QRunnable, QThreadPool
 from PySide6.QtGui import QPainter, QColor, QPen, QFont, QPolygonF
 from PySide6.QtWidgets import QWidget
 from PySide6.QtWebEngineWidgets import QWebEngineView
 from PySide6.QtWebChannel import QWebChannel
 
+import ast
 import importlib
+import importlib.util
 import pkgutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from plugins.plugin_interface import IEmotePlugin
 
 import BoundParams
 from BoundParams import SpecialUsage
 from logger_config import emote_widget_logger as logger
 
+# orjson 可选：解析/序列化 JS 桥两侧的 JSON 快一个数量级，没装则回退标准库
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+def _json_loads(s):
+    if _orjson is not None:
+        return _orjson.loads(s)
+    return json.loads(s)
+
+def _json_dumps(obj) -> str:
+    """小对象转 JS 字面量的热路径序列化（字符串转义、bool/None 映射等）。"""
+    if _orjson is not None:
+        return _orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+# 自由线程构建（PYTHON_GIL=0）下音频解码和口型分析两条线程可真正并行；
+# sys._is_gil_enabled 只在这类构建里存在，常规解释器一律视为 GIL 开启
+_GIL_ENABLED = getattr(sys, "_is_gil_enabled", lambda: True)()
+
+# SpecialUsage 的标签集在编译期就固定了，导入时内省一次，之后直接取用
+_SPECIAL_USAGE_TAGS = tuple(
+    getattr(SpecialUsage, attr)
+    for attr in dir(SpecialUsage)
+    if not attr.startswith('__')
+)
+
+_BG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'web_frontend', 'backgrounds')
+
+@lru_cache(maxsize=64)
+def _resolve_bg_url(image_filename: str):
+    """
+    把背景图文件名解析成 file:// URL，按文件名缓存。
+    背景轮播这类场景会反复切换同几张图，没必要每次都做路径拼接和磁盘探测。
+    返回 (url, exists)；文件不存在时 url 为 None。
+    """
+    bg_path = os.path.abspath(os.path.join(_BG_DIR, image_filename))
+    if not os.path.exists(bg_path):
+        return None, False
+    return QUrl.fromLocalFile(bg_path).toString(), True
+
 
 DEFAULT_CONFIG = {
     "animation": {
@@ -56,6 +104,7 @@ DEFAULT_CONFIG = {
     },
     "file_streaming": {
         "blocksize_hz": 30,
+        "queue_batch_blocks": 3,  # 攒几个块再入队一次，降低消费者唤醒频率
     }
 }
 
@@ -114,17 +163,95 @@ class PluginLoaderWorker(QObject):
     # 信号3: 所有插件实例化完成，并携带实例列表
     finished = Signal(list)
 
+    # AST 预扫描结果缓存：键为源文件路径，值为 {"mtime": ..., "has_plugin": ...}
+    _SCAN_CACHE_PATH = os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), ".emote_cache", "plugin_scan.json"
+    )
+
     def __init__(self):
         super().__init__()
         self._modules_to_load = []
+        self._cancelled = False
+
+    def cancel(self):
+        """请求中止加载。可从任意线程调用，run_loading 会在当前模块完成后收尾。"""
+        self._cancelled = True
 
     def scan_for_plugin_modules(self):
         """快速扫描插件，这个方法在主线程中被调用。"""
         import plugins
         logger.info("开始扫描插件目录...")
+        scan_cache = self._load_scan_cache()
+        cache_dirty = False
         for _, module_name, is_pkg in pkgutil.walk_packages(path=plugins.__path__, prefix=plugins.__name__ + '.'):
-            if not module_name.endswith('.plugin_interface') and not is_pkg:
+            if module_name.endswith('.plugin_interface') or is_pkg:
+                continue
+
+            # 先用 AST 静态确认模块里确实有 IEmotePlugin 子类再导入，
+            # 避免为纯工具模块执行一遍顶层代码（Qt 控件、模型加载等）
+            source_path = None
+            try:
+                spec = importlib.util.find_spec(module_name)
+                source_path = spec.origin if spec else None
+            except Exception:
+                source_path = None
+
+            if not source_path or not os.path.isfile(source_path):
+                # 拿不到源码（如打包环境）就保守放行
                 self._modules_to_load.append(module_name)
+                continue
+
+            mtime = os.path.getmtime(source_path)
+            cached = scan_cache.get(source_path)
+            if cached and cached.get("mtime") == mtime:
+                has_plugin = cached.get("has_plugin", True)
+            else:
+                has_plugin = self._source_defines_plugin(source_path)
+                scan_cache[source_path] = {"mtime": mtime, "has_plugin": has_plugin}
+                cache_dirty = True
+
+            if has_plugin:
+                self._modules_to_load.append(module_name)
+            else:
+                logger.debug(f"预扫描未发现插件类，跳过模块: {module_name}")
+
+        if cache_dirty:
+            self._save_scan_cache(scan_cache)
+
+    @staticmethod
+    def _source_defines_plugin(source_path: str) -> bool:
+        """静态解析源文件，检查是否定义了以 IEmotePlugin 为基类的类。"""
+        try:
+            with open(source_path, "r", encoding="utf-8") as f:
+                tree = ast.parse(f.read())
+        except (OSError, SyntaxError, ValueError):
+            # 读不了或解析不了就保守放行，让真正的导入去报错
+            return True
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ClassDef):
+                for base in node.bases:
+                    base_name = base.id if isinstance(base, ast.Name) else getattr(base, "attr", None)
+                    if base_name == "IEmotePlugin":
+                        return True
+        return False
+
+    @classmethod
+    def _load_scan_cache(cls) -> dict:
+        try:
+            with open(cls._SCAN_CACHE_PATH, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+            return cache if isinstance(cache, dict) else {}
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    @classmethod
+    def _save_scan_cache(cls, scan_cache: dict):
+        try:
+            os.makedirs(os.path.dirname(cls._SCAN_CACHE_PATH), exist_ok=True)
+            with open(cls._SCAN_CACHE_PATH, "w", encoding="utf-8") as f:
+                json.dump(scan_cache, f, ensure_ascii=False, indent=4)
+        except OSError:
+            logger.warning("写入插件扫描缓存失败。", exc_info=True)
 
     @Slot()
     def run_loading(self):
@@ -140,30 +267,52 @@ class PluginLoaderWorker(QObject):
             self.finished.emit(successfully_instantiated_plugins)
             return
             
-        for i, module_name in enumerate(self._modules_to_load):
-            progress = (i + 1) / total_plugins
-            self.progress_updated.emit(progress, f"正在实例化: {module_name}")
-
-            try:
-
-                module = importlib.import_module(module_name)
-                found = False
-                for item_name in dir(module):
-                    item = getattr(module, item_name)
-                    if isinstance(item, type) and issubclass(item, IEmotePlugin) and item is not IEmotePlugin:
-                        plugin_instance = item()
+        # 导入大多在等磁盘和解码 .pyc，期间会释放 GIL；
+        # 互不依赖的插件丢进线程池并行导入，冷缓存下能明显缩短启动时间
+        max_workers = min(4, total_plugins)
+        done_count = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            future_to_module = {
+                pool.submit(self._instantiate_module, module_name): module_name
+                for module_name in self._modules_to_load
+            }
+            for future in as_completed(future_to_module):
+                if self._cancelled:
+                    for pending in future_to_module:
+                        pending.cancel()
+                    break
+                module_name = future_to_module[future]
+                done_count += 1
+                self.progress_updated.emit(done_count / total_plugins, f"正在实例化: {module_name}")
+                try:
+                    for plugin_instance in future.result():
                         successfully_instantiated_plugins.append(plugin_instance)
                         self.log_message.emit(f"✓ 成功实例化插件: {plugin_instance.get_name()}", False)
-                        found = True
-                if not found: raise RuntimeError("模块中未找到 IEmotePlugin 实现。")
-            except Exception as e:
-                msg = f"✗ 插件 '{module_name}' 实例化失败: {e}"
-                self.log_message.emit(msg, True)
-                logger.error(msg, exc_info=True)
-                
+                except Exception as e:
+                    msg = f"✗ 插件 '{module_name}' 实例化失败: {e}"
+                    self.log_message.emit(msg, True)
+                    logger.error(msg, exc_info=True)
+
+        if self._cancelled:
+            logger.info("插件实例化被取消，跳过 finished 通知。")
+            return
+
         self.finished.emit(successfully_instantiated_plugins)
         logger.info("后台 Worker 完成插件实例化。")
 
+    @staticmethod
+    def _instantiate_module(module_name: str) -> list:
+        """导入单个模块并实例化其中全部 IEmotePlugin 实现（线程池工作函数）。"""
+        module = importlib.import_module(module_name)
+        instances = []
+        for item_name in dir(module):
+            item = getattr(module, item_name)
+            if isinstance(item, type) and issubclass(item, IEmotePlugin) and item is not IEmotePlugin:
+                instances.append(item())
+        if not instances:
+            raise RuntimeError("模块中未找到 IEmotePlugin 实现。")
+        return instances
+
 
 # ------------------------------------------------------------------------------
 #  内部通信桥梁
@@ -203,6 +352,175 @@ class _PythonApiBridge(QObject):
 # ------------------------------------------------------------------------------
 # 口型同步处理线程
 # ------------------------------------------------------------------------------
+
+# numpy-rms 可选：C+SIMD 单遍融合 平方/均值/开方，没装则用 einsum 回退
+try:
+    from numpy_rms import rms as _numpy_rms
+except ImportError:
+    _numpy_rms = None
+
+def _chunk_rms(chunk) -> float:
+    """计算一块音频的 RMS。einsum 路径不会像 x**2 那样分配临时数组。"""
+    if _numpy_rms is not None:
+        return float(_numpy_rms(chunk, length=chunk.size)[0])
+    flat = chunk.ravel()
+    if flat.size == 0:
+        return 0.0
+    return float(np.sqrt(np.einsum('i,i->', flat, flat) / flat.size))
+
+def _ema_step(current_rms, mean_rms, peak_rms,
+              mean_smoothing, one_minus_mean, peak_smoothing, activation_ratio):
+    """
+    双 EMA 衰减的一步更新。
+    纯标量计算抽成模块函数，装了 numba 时编译为原生代码并释放 GIL。
+    补数 (1 - alpha) 由调用方预先算好，更新就是一条标准的 a*prev + b*x FMA。
+    返回 (mean_rms, peak_rms, mouth_open_ratio, activation_threshold)。
+    """
+    mean_rms = mean_rms * mean_smoothing + current_rms * one_minus_mean
+    decayed_peak = peak_rms * peak_smoothing
+    peak_rms = current_rms if current_rms > decayed_peak else decayed_peak
+
+    dynamic_range = peak_rms - mean_rms
+    activation_threshold = mean_rms + activation_ratio * dynamic_range
+
+    mouth_open_ratio = 0.0
+    if current_rms > activation_threshold and dynamic_range > 0.001:  # 避免在静音时抖动
+        effective_range = peak_rms - activation_threshold
+        mouth_open_ratio = (current_rms - activation_threshold) / (effective_range + 1e-6)
+        if mouth_open_ratio < 0.0:
+            mouth_open_ratio = 0.0
+        elif mouth_open_ratio > 1.0:
+            mouth_open_ratio = 1.0
+    return mean_rms, peak_rms, mouth_open_ratio, activation_threshold
+
+def _lip_sync_step(x, mean_rms, peak_rms,
+                   mean_smoothing, one_minus_mean, peak_smoothing, activation_ratio):
+    """
+    单块音频（一维数组）的完整口型步进：RMS 归约 + EMA 更新一次调用完成。
+    无 numba 时走 NumPy 归约 + 纯 Python 步进；
+    返回 (current_rms, mean_rms, peak_rms, mouth_open_ratio, activation_threshold)。
+    """
+    current_rms = _chunk_rms(x)
+    mean_rms, peak_rms, mouth_open_ratio, activation_threshold = _ema_step(
+        current_rms, mean_rms, peak_rms,
+        mean_smoothing, one_minus_mean, peak_smoothing, activation_ratio
+    )
+    return current_rms, mean_rms, peak_rms, mouth_open_ratio, activation_threshold
+
+# numba 可选：有就把整个热路径编译成原生代码（nogil 让音频线程不跟 UI 抢解释器）
+try:
+    from numba import njit as _njit
+    _ema_step = _njit(cache=True, nogil=True)(_ema_step)
+
+    # 融合内核：平方和、开方、双 EMA 全在一个循环里，LLVM 能对
+    # 平方和做 SIMD FMA 向量化，块与块之间不落任何临时数组
+    @_njit(cache=True, nogil=True, fastmath=True)
+    def _lip_sync_step(x, mean_rms, peak_rms,  # noqa: F811
+                       mean_smoothing, one_minus_mean, peak_smoothing, activation_ratio):
+        n = x.size
+        s = 0.0
+        for i in range(n):
+            s += x[i] * x[i]
+        current_rms = np.sqrt(s / n) if n > 0 else 0.0
+
+        mean_rms = mean_rms * mean_smoothing + current_rms * one_minus_mean
+        decayed_peak = peak_rms * peak_smoothing
+        peak_rms = current_rms if current_rms > decayed_peak else decayed_peak
+
+        dynamic_range = peak_rms - mean_rms
+        activation_threshold = mean_rms + activation_ratio * dynamic_range
+        mouth_open_ratio = 0.0
+        if current_rms > activation_threshold and dynamic_range > 0.001:
+            effective_range = peak_rms - activation_threshold
+            mouth_open_ratio = (current_rms - activation_threshold) / (effective_range + 1e-6)
+            if mouth_open_ratio < 0.0:
+                mouth_open_ratio = 0.0
+            elif mouth_open_ratio > 1.0:
+                mouth_open_ratio = 1.0
+        return current_rms, mean_rms, peak_rms, mouth_open_ratio, activation_threshold
+except ImportError:
+    pass
+
+class _AudioBufferPool:
+    """
+    固定大小的 float32 缓冲池：生产者借出、消费者用完归还。
+    稳态下音频链路不再每块分配新数组，避免持续流式播放时的 GC 压力。
+    """
+    def __init__(self, count: int, size: int):
+        self._size = size
+        self._free = queue.Queue()
+        for _ in range(count):
+            self._free.put(np.empty(size, dtype=np.float32))
+
+    def acquire(self):
+        """借出一块缓冲。池子暂时耗尽时临时补一块，归还后并入池子复用。"""
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            return np.empty(self._size, dtype=np.float32)
+
+    def release(self, chunk):
+        """归还缓冲。传入的可能是切片视图，归还其底层数组。"""
+        base = chunk.base
+        self._free.put(base if base is not None else chunk)
+
+
+class _FnRunnable(QRunnable):
+    """把任意工作函数包装成 QRunnable，投给线程池执行。"""
+    def __init__(self, fn):
+        super().__init__()
+        self._fn = fn
+        self.setAutoDelete(True)
+
+    def run(self):
+        self._fn()
+
+
+class _ParsedResultDispatcher(QObject):
+    """跨线程信使：后台线程解析完的结果经队列连接送回主线程执行回调。"""
+    parsed = Signal(object, object)  # (callback, data)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.parsed.connect(self._deliver)
+
+    @Slot(object, object)
+    def _deliver(self, callback, data):
+        callback(data)
+
+
+class AudioChunkQueue:
+    """
+    面向音频块的轻量 FIFO。
+
+    CPython 的 deque append/popleft 自身就是线程安全的，省掉 queue.Queue
+    每次 put/get 的锁 + 条件变量开销；maxlen 封顶让消费者卡住时表现为
+    丢弃最旧块的背压，而不是无界堆积。
+    接口与 queue.Queue 的非阻塞子集兼容（put/get_nowait/empty）。
+    """
+    def __init__(self, maxlen: int = 32):
+        self._chunks = collections.deque(maxlen=maxlen)
+        self._event = threading.Event()
+
+    def put(self, chunk):
+        self._chunks.append(chunk)
+        self._event.set()
+
+    def get_nowait(self):
+        try:
+            return self._chunks.popleft()
+        except IndexError:
+            self._event.clear()
+            raise queue.Empty from None
+
+    def empty(self) -> bool:
+        return not self._chunks
+
+    def wait(self, timeout=None) -> bool:
+        """等待有新块到达，供需要阻塞语义的消费者使用。"""
+        return self._event.wait(timeout)
+
+
 class StreamLipSyncThread(QThread):
     """
     (双EMA衰减版) 使用两个指数移动平均来追踪音频的基线和峰值，
@@ -220,13 +538,20 @@ class StreamLipSyncThread(QThread):
         super().__init__()
         self.audio_queue = audio_queue
         self.is_running = False
+        # 生产者（如 stream_audio_file）可挂接一个 _AudioBufferPool，
+        # 消费完的块会归还进去复用
+        self.buffer_pool = None
+        self._stop_event = threading.Event()
 
         if update_fps <= 0: update_fps = 1
+        self._tick_interval = 1.0 / update_fps
 
         # 根据衰减时间计算出每帧的平滑因子 (alpha)
         # alpha = exp(-delta_time / decay_time)
-        self.mean_smoothing = np.exp(-1 / (mean_decay_time * update_fps))
-        self.peak_smoothing = np.exp(-1 / (peak_decay_time * update_fps))
+        # 转成 Python float，后面的标量运算不必拖着 NumPy 标量升格到 float64
+        self.mean_smoothing = float(np.exp(-1 / (mean_decay_time * update_fps)))
+        self.peak_smoothing = float(np.exp(-1 / (peak_decay_time * update_fps)))
+        self._one_minus_mean = 1.0 - self.mean_smoothing
         
         # EMA状态变量
         self.mean_rms = 0.0
@@ -238,33 +563,63 @@ class StreamLipSyncThread(QThread):
     def run(self):
         self.is_running = True
         logger.info(f"StreamLipSync (EMA Decay): 线程启动，正在等待音频流...")
+        # 按 1/update_fps 的固定节拍走：每拍非阻塞取走积压的块，
+        # 空拍走确定性的峰值衰减，不再靠 1 秒超时的粗粒度轮询
+        tick = self._tick_interval
+        next_tick = time.monotonic() + tick
         while self.is_running:
+            if self._stop_event.is_set():
+                break
+            now = time.monotonic()
+            if now < next_tick:
+                time.sleep(next_tick - now)
+            else:
+                # 已经落后就对齐到当前时间，避免积欠的拍子连发
+                next_tick = now
+            next_tick += tick
             try:
-                audio_chunk = self.audio_queue.get(timeout=1)
-                if audio_chunk is None: break
-
-                current_rms = np.sqrt(np.mean(audio_chunk**2))
+                # 队列积压时一次吃掉一小批，EMA 逐块递推但只发射最终状态，
+                # 省掉每块一次的跨线程信号开销
+                chunks = []
+                sentinel_seen = False
+                while len(chunks) < 8:
+                    try:
+                        audio_chunk = self.audio_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if audio_chunk is None:
+                        sentinel_seen = True
+                        break
+                    chunks.append(audio_chunk)
+
+                if not chunks:
+                    if sentinel_seen: break
+                    # 本拍无数据，让峰值继续自然衰减
+                    self.peak_rms *= self.peak_smoothing
+                    self.mouth_open_ratio_updated.emit(0.0)
+                    self.debug_data_updated.emit({
+                        "rms": 0.0, "mean": self.mean_rms,
+                        "peak": self.peak_rms, "threshold": self.mean_rms
+                    })
+                    continue
+
+                for raw_chunk in chunks:
+                    # 统一到 float32：减半内存带宽，SIMD 通道数翻倍（产线已是 float32 时零拷贝）
+                    audio_chunk = raw_chunk
+                    if audio_chunk.dtype != np.float32:
+                        audio_chunk = audio_chunk.astype(np.float32, copy=False)
+
+                    # RMS 归约 + 双 EMA + 阈值/开合度一步完成，见 _lip_sync_step
+                    (current_rms, self.mean_rms, self.peak_rms,
+                     mouth_open_ratio, activation_threshold) = _lip_sync_step(
+                        audio_chunk.ravel(), self.mean_rms, self.peak_rms,
+                        self.mean_smoothing, self._one_minus_mean,
+                        self.peak_smoothing, self.activation_ratio
+                    )
+
+                    if self.buffer_pool is not None:
+                        self.buffer_pool.release(raw_chunk)
 
-                # 双EMA衰减
-                # 1. 更新慢速EMA (基线)，它总是趋向于当前音量
-                self.mean_rms = self.mean_rms * self.mean_smoothing + current_rms * (1 - self.mean_smoothing)
-                
-                # 2. 更新快速EMA (峰值)
-                #    如果当前音量大于峰值，峰值立刻跳到当前音量
-                #    否则，峰值按自己的速率衰减
-                self.peak_rms = max(current_rms, self.peak_rms * self.peak_smoothing)
-
-                # 3. 计算动态范围和激活阈值
-                dynamic_range = self.peak_rms - self.mean_rms
-                activation_threshold = self.mean_rms + self.activation_ratio * dynamic_range
-                
-                mouth_open_ratio = 0.0
-                if current_rms > activation_threshold and dynamic_range > 0.001: # 避免在静音时抖动
-                    # 计算开合度：当前音量在 (阈值 ~ 峰值) 这个区间中所占的比例
-                    effective_range = self.peak_rms - activation_threshold
-                    mouth_open_ratio = (current_rms - activation_threshold) / (effective_range + 1e-6)
-                    mouth_open_ratio = max(0.0, min(mouth_open_ratio, 1.0))
-                
                 logger.debug(
                     f"LIP_SYNC_DEBUG -- "
                     f"RMS: {current_rms:.4f} | "
@@ -282,25 +637,18 @@ class StreamLipSyncThread(QThread):
                 
                 self.mouth_open_ratio_updated.emit(mouth_open_ratio)
 
-            except queue.Empty:
-                # 如果超时，让峰值继续自然衰减
-                self.peak_rms *= self.peak_smoothing
-                self.mouth_open_ratio_updated.emit(0.0)
-                self.debug_data_updated.emit({
-                    "rms": 0.0, "mean": self.mean_rms,
-                    "peak": self.peak_rms, "threshold": self.mean_rms
-                })
-                continue
+                if sentinel_seen: break
+
             except Exception as e:
                 logger.error(f"StreamLipSync (EMA Decay): 处理音频块时出错: ", exc_info=True)
         
         logger.info("StreamLipSync (EMA Decay): 线程已停止。")
 
     def stop(self):
+        # 不再逐个清空队列：置停止事件即可让 run 在下一拍立刻退出，
+        # 与生产者并发 put 也不会竞态；残留的块随队列一起被回收
+        self._stop_event.set()
         self.is_running = False
-        while not self.audio_queue.empty():
-            try: self.audio_queue.get_nowait()
-            except queue.Empty: break
         self.audio_queue.put(None)
 
 
@@ -313,8 +661,11 @@ class LipSyncMonitorWidget(QWidget):
         super().__init__(parent)
         self.setMinimumHeight(120)
         self.history_len = 200
-        self.rms_history = collections.deque(maxlen=self.history_len)
-        self.threshold_history = collections.deque(maxlen=self.history_len)
+        # 环形缓冲：写入是一次标量赋值，绘制侧拿到的直接就是连续数组
+        self.rms_buf = np.zeros(self.history_len, dtype=np.float32)
+        self.threshold_buf = np.zeros(self.history_len, dtype=np.float32)
+        self._widx = 0
+        self._count = 0
         self.current_peak = 0.0
         self.current_mean = 0.0
         self.max_val_seen = 0.1
@@ -326,18 +677,39 @@ class LipSyncMonitorWidget(QWidget):
         self.text_color = QColor("#DDDDDD")
         self.grid_color = QColor("#444444")
         self.font = QFont("Arial", 10)
+        # 折线 x 坐标只依赖控件宽度，缓存一份，宽度变了再重算
+        self._xs = None
+        self._xs_width = -1
+        # 音频帧 30+ Hz 到达，重绘按显示帧率合并：数据只置脏，定时器统一刷新
+        self._dirty = False
+        self._repaint_timer = QTimer(self)
+        self._repaint_timer.setInterval(33)
+        self._repaint_timer.timeout.connect(self._flush_repaint)
+        self._repaint_timer.start()
+    @Slot()
+    def _flush_repaint(self):
+        if self._dirty and self.isVisible():
+            self._dirty = False
+            self.update()
     @Slot(dict)
     def update_data(self, data: dict):
+        if not self.isVisible():
+            # 监视器默认隐藏，隐藏时连缓冲写入都省掉
+            return
         rms = data.get("rms", 0.0)
         mean = data.get("mean", 0.0)
         peak = data.get("peak", 0.0)
         threshold = data.get("threshold", 0.0)
-        self.rms_history.append(rms)
-        self.threshold_history.append(threshold)
+        i = self._widx
+        self.rms_buf[i] = rms
+        self.threshold_buf[i] = threshold
+        self._widx = (i + 1) % self.history_len
+        if self._count < self.history_len:
+            self._count += 1
         self.current_mean = mean
         self.current_peak = peak
         self.max_val_seen = max(self.max_val_seen, peak, rms) * 0.995
-        self.update()
+        self._dirty = True
     def paintEvent(self, event):
         """在这里执行所有自定义绘制。"""
         painter = QPainter(self)
@@ -368,31 +740,41 @@ class LipSyncMonitorWidget(QWidget):
         painter.fillRect(padding + 10, int(chart_y_origin - mean_h), bar_width, int(mean_h), self.mean_color)
         painter.fillRect(padding + 50, int(chart_y_origin - peak_h), bar_width, int(peak_h), self.peak_color)
 
-        if not self.rms_history:
+        if self._count == 0:
             painter.end()
             return
+
+        # y 坐标整批用 NumPy 算好，Python 侧只剩打包 QPointF
+        if self._xs is None or self._xs_width != w:
+            self._xs = padding + (w - 2 * padding) * (
+                np.arange(self.history_len, dtype=np.float64) / (self.history_len - 1)
+            )
+            self._xs_width = w
+
+        n = self._count
+        if n < self.history_len:
+            rms_vals = self.rms_buf[:n]
+            thr_vals = self.threshold_buf[:n]
+        else:
+            # 写满后按写指针滚动一次，得到时间顺序的视图
+            rms_vals = np.roll(self.rms_buf, -self._widx)
+            thr_vals = np.roll(self.threshold_buf, -self._widx)
+        xs = self._xs[:n].tolist()
+
+        rms_ys = (chart_y_origin - rms_vals * y_scale).tolist()
         painter.setPen(QPen(self.rms_color, 2))
-        rms_points = QPolygonF()
-        for i, val in enumerate(self.rms_history):
-            x = padding + (w - 2*padding) * (i / (self.history_len - 1))
-            y = chart_y_origin - val * y_scale
-            rms_points.append(QPointF(x, y))
-        painter.drawPolyline(rms_points)
-        
+        painter.drawPolyline(QPolygonF([QPointF(x, y) for x, y in zip(xs, rms_ys)]))
+
+        thr_ys = (chart_y_origin - thr_vals * y_scale).tolist()
         painter.setPen(QPen(self.threshold_color, 2, Qt.DashLine))
-        threshold_points = QPolygonF()
-        for i, val in enumerate(self.threshold_history):
-            x = padding + (w - 2*padding) * (i / (self.history_len - 1))
-            y = chart_y_origin - val * y_scale
-            threshold_points.append(QPointF(x, y))
-        painter.drawPolyline(threshold_points)
+        painter.drawPolyline(QPolygonF([QPointF(x, y) for x, y in zip(xs, thr_ys)]))
         painter.setFont(self.font)
         painter.setPen(self.text_color)
         painter.drawText(padding + 10, h - 5, f"Mean: {self.current_mean:.3f}")
         painter.drawText(padding + 90, h - 5, f"Peak: {self.current_peak:.3f}")
         legend_y = padding + 10
-        rms_text = f"RMS: {self.rms_history[-1]:.3f}"
-        threshold_text = f"Threshold: {self.threshold_history[-1]:.3f}"
+        rms_text = f"RMS: {rms_vals[-1]:.3f}"
+        threshold_text = f"Threshold: {thr_vals[-1]:.3f}"
         
         painter.setBrush(self.rms_color); painter.drawRect(w - 120, legend_y - 10, 10, 10)
         painter.drawText(w - 105, legend_y, rms_text)
@@ -476,7 +858,11 @@ class EmoteWidget(QWebEngineView):
         super().__init__(parent)
         logger.debug("EmoteWidget.__init__: super().__init__() 已调用。")
 
-        self.config = json.loads(json.dumps(DEFAULT_CONFIG))
+        # DEFAULT_CONFIG 固定两层深，手动浅拷贝子字典即可，免去 JSON 编解码一轮
+        self.config = {
+            k: (v.copy() if isinstance(v, dict) else v)
+            for k, v in DEFAULT_CONFIG.items()
+        }
         # 如果用户提供了覆盖配置，则进行合并
         if config_override:
             for key, value in config_override.items():
@@ -499,6 +885,9 @@ class EmoteWidget(QWebEngineView):
         self._plugin_loader_thread.started.connect(self._plugin_loader_worker.run_loading)
 
         self._splash_start_time = 0
+        # 启动画面更新先攒进缓冲，同一事件循环拍内的调用合并成一次 runJavaScript
+        self._splash_js_buf = []
+        self._splash_flush_scheduled = False
 
         # 启动加载
         self._is_splash_dismissed = False
@@ -507,9 +896,32 @@ class EmoteWidget(QWebEngineView):
 
         # 音频同步
         self._lip_sync_thread = None
-        self._last_mouth_ratio = 0.0
+        # -1.0 保证首帧和重置后的第一次更新一定会被派发
+        self._last_mouth_ratio = -1.0
+        # 每个播放会话持有自己的停止事件（见 start_lip_sync_from_file）：
+        # 被顶替的旧流水线看到的是自己那个已置位的事件，保证会退出，
+        # 不会因为共享事件被新会话清掉而继续往持久化输出流里写
         self._streamer_stop_event = threading.Event()
 
+        # 嘴型更新合并器：同步线程按 update_fps 投递目标值，这里只记录最新值，
+        # 由主线程定时器按显示帧节奏统一派发，避免每帧都走一次 JS 桥。
+        self._pending_mouth_ratio = None
+        self._mouth_dispatch_timer = QTimer(self)
+        self._mouth_dispatch_timer.setInterval(16)
+        self._mouth_dispatch_timer.timeout.connect(self._dispatch_pending_mouth)
+        # 嘴型映射曲线查表，start_lip_sync 时按当前配置预计算
+        self._curve_lut = None
+
+        # 文件流工作线程走复用的线程池：快速连续的播放请求（如逐句 TTS）
+        # 不再每次都新建/销毁 OS 线程，超过 2 个并发请求时廉价地排队
+        self._streamer_pool = QThreadPool(self)
+        self._streamer_pool.setMaxThreadCount(2)
+
+        # 持久化的输出流：设备冷启动可达上百毫秒，跨播放复用，参数变了才重开
+        self._out_stream = None
+        self._out_stream_params = (None, None)
+        self._out_stream_lock = threading.Lock()
+
         self._monitor_widget = LipSyncMonitorWidget()
         self._monitor_widget.setWindowTitle("音频同步监视器")
         self._monitor_widget.setVisible(False)
@@ -596,28 +1008,50 @@ class EmoteWidget(QWebEngineView):
             self._update_splash_main_progress(1.0, "所有加载步骤完成！")
             self._dismiss_splash_screen()
 
+    def _queue_splash_js(self, stmt: str):
+        """
+        攒一条启动画面 JS 语句，下一拍事件循环统一刷出。
+
+        插件加载时日志和进度更新是成串到达的，每条都单独 runJavaScript
+        就是一次到渲染进程的 IPC；合并后一阵只跨一次进程边界。
+        """
+        self._splash_js_buf.append(stmt)
+        if not self._splash_flush_scheduled:
+            self._splash_flush_scheduled = True
+            QTimer.singleShot(0, self._flush_splash_js)
+
+    @Slot()
+    def _flush_splash_js(self):
+        self._splash_flush_scheduled = False
+        if not self._splash_js_buf:
+            return
+        script = "\n".join(self._splash_js_buf)
+        self._splash_js_buf.clear()
+        self.page().runJavaScript(script)
+
     def _update_splash_main_progress(self, progress: float, text: str):
-        safe_text = json.dumps(text)
-        self.page().runJavaScript(f"SplashScreenAPI.updateMainProgress({progress}, {safe_text});")
+        safe_text = _json_dumps(text)
+        self._queue_splash_js(f"SplashScreenAPI.updateMainProgress({progress}, {safe_text});")
 
     def _update_splash_plugin_progress(self, progress: float, text: str):
-        safe_text = json.dumps(text)
-        self.page().runJavaScript(f"SplashScreenAPI.updatePluginProgress({progress}, {safe_text});")
+        safe_text = _json_dumps(text)
+        self._queue_splash_js(f"SplashScreenAPI.updatePluginProgress({progress}, {safe_text});")
 
     def _add_splash_log(self, message: str, is_error: bool = False):
-        safe_message = json.dumps(message)
+        safe_message = _json_dumps(message)
         js_bool = "true" if is_error else "false"
-        self.page().runJavaScript(f"SplashScreenAPI.addLog({safe_message}, {js_bool});")
-    
+        self._queue_splash_js(f"SplashScreenAPI.addLog({safe_message}, {js_bool});")
+
     def _update_splash_version(self):
-        safe_version = json.dumps(__version__)
-        self.page().runJavaScript(f"SplashScreenAPI.setVersion({safe_version});")
+        safe_version = _json_dumps(__version__)
+        self._queue_splash_js(f"SplashScreenAPI.setVersion({safe_version});")
 
     def _dismiss_splash_screen(self):
         if self._is_splash_dismissed: return
         self._is_splash_dismissed = True
         logger.info("所有加载步骤完成，正在隐藏启动画面...")
-        self.page().runJavaScript("setTimeout(() => { SplashScreenAPI.dismiss(); }, 500);")
+        # 走同一个缓冲，保证排在此前的进度/日志更新先送达
+        self._queue_splash_js("setTimeout(() => { SplashScreenAPI.dismiss(); }, 500);")
 
     def _proceed_to_model_loading_step(self):
         """
@@ -657,24 +1091,61 @@ class EmoteWidget(QWebEngineView):
 
         self.get_variables(on_variables_received)
 
+    @property
+    def variable_map(self) -> dict:
+        return self._variable_map
+
+    @variable_map.setter
+    def variable_map(self, new_map: dict):
+        self._variable_map = new_map
+        self._usage_index = None
+        self._gaze_params_json = None
+
+    def invalidate_usage_index(self):
+        """variable_map 被就地修改（如 Tester 的绑定面板）后调用，丢弃反查表。"""
+        self._usage_index = None
+        self._gaze_params_json = None
+
     def find_param_by_usage(self, usage_tag: str) -> dict | None:
         """根据特殊用途标签查找参数的完整信息。"""
-        for param_info in self.variable_map.values():
-            if isinstance(param_info, dict) and usage_tag in param_info.get("special_usage", []):
-                return param_info
-        return None
+        if self._usage_index is None:
+            # 建一次 tag -> 参数信息 的反查表，之后每次查询都是 O(1)。
+            # setdefault 保持与原先线性扫描一致的"先到先得"语义。
+            index = {}
+            for param_info in self._variable_map.values():
+                if isinstance(param_info, dict):
+                    for tag in param_info.get("special_usage", []):
+                        index.setdefault(tag, param_info)
+            self._usage_index = index
+        return self._usage_index.get(usage_tag)
 
     def closeEvent(self, event):
         """
         重写 closeEvent 以确保所有后台资源被正确清理。
         """
         logger.info("EmoteWidget 正在关闭，开始清理资源...")
-        
+
         self.stop_lip_sync()
 
+        with self._out_stream_lock:
+            if self._out_stream is not None:
+                try:
+                    self._out_stream.stop()
+                    self._out_stream.close()
+                except Exception:
+                    logger.warning("关闭输出流时出错。", exc_info=True)
+                self._out_stream = None
+                self._out_stream_params = (None, None)
+
         if self._plugin_loader_thread and self._plugin_loader_thread.isRunning():
             logger.info("正在请求插件加载线程退出...")
-            self._plugin_loader_thread.terminate()
+            # 协作式退出：置取消标志让 run_loading 自然收尾，再退出事件循环。
+            # terminate() 会把模块留在半初始化状态、锁也可能不释放，只作最后手段。
+            self._plugin_loader_worker.cancel()
+            self._plugin_loader_thread.quit()
+            if not self._plugin_loader_thread.wait(2000):
+                logger.warning("插件加载线程未在 2 秒内退出，强制终止。")
+                self._plugin_loader_thread.terminate()
             self._plugin_loader_thread.deleteLater()
         
         if self.plugins:
@@ -691,9 +1162,18 @@ class EmoteWidget(QWebEngineView):
     # --- 槽函数 ---
     @Slot(float)
     def _on_mouth_ratio_update(self, open_ratio):
+        """接收开合度，只记下最新值，真正的派发交给 _dispatch_pending_mouth。"""
+        self._pending_mouth_ratio = open_ratio
+
+    @Slot()
+    def _dispatch_pending_mouth(self):
         """
-        (非线性映射+过饱和处理) 接收开合度，并将其通过曲线放大,支持乘比例系数达到过饱和效果。
+        (非线性映射+过饱和处理) 取出待派发的开合度，并将其通过曲线放大,支持乘比例系数达到过饱和效果。
         """
+        open_ratio = self._pending_mouth_ratio
+        if open_ratio is None:
+            return
+        self._pending_mouth_ratio = None
         # --- 非线性重映射 + 过饱和处理 ---
         # 对 open_ratio 取平方根 (或一个指数)。
         # 这会产生一个曲线，使得小的值被显著放大(系数小于0)/大的值被缩小(系数大于0)。
@@ -703,20 +1183,37 @@ class EmoteWidget(QWebEngineView):
         # 使得曲线的末端可以超过1.0，从而增加最终停留在1.0的时间。
         # 在self.lip_sync_curve处自定义指数 , 在这里自定义系数(我感觉1.1够用，嘻嘻)
 
-        lip_sync_config = self.config['lip_sync']
-        final_ratio = (open_ratio ** lip_sync_config['mouth_ratio_curve']) * lip_sync_config['mouth_ratio_oversaturation']
-        final_ratio = max(0.0, min(final_ratio, 1.0))
+        # 曲线在 start_lip_sync 时已预计算成 256 档查表，这里只做一次索引
+        idx = int(open_ratio * 255.0)
+        if idx < 0:
+            idx = 0
+        elif idx > 255:
+            idx = 255
+        final_ratio = float(self._curve_lut[idx])
+
+        # 亚感知级的微小变化（如 0.503 -> 0.504）渲染出来没有区别，不值一次 JS 调用
+        if abs(final_ratio - self._last_mouth_ratio) < 0.005:
+            return
+        self._last_mouth_ratio = final_ratio
 
         param_info = self.mouth_param_info
         param_range = param_info['range'][1] - param_info['range'][0]
         target_value = param_info['range'][0] + final_ratio * param_range
         
-        self.set_variable(param_info['name'], target_value, duration_ms=lip_sync_config['set_variable_duration_ms'])
+        self.set_variable(param_info['name'], target_value,
+                          duration_ms=self.config['lip_sync']['set_variable_duration_ms'])
 
     @Slot()
     def _reset_mouth_on_sync_finish(self):
         """当同步线程结束时，平滑地关闭嘴巴。"""
+        # 会话被快速替换时，旧线程排队的 finished 会在新会话启动之后才送达；
+        # 不是当前线程发来的就直接忽略，免得停掉新会话刚启动的派发定时器
+        if self.sender() is not self._lip_sync_thread:
+            return
         logger.info("同步结束，正在重置嘴型。")
+        self._mouth_dispatch_timer.stop()
+        self._pending_mouth_ratio = None
+        self._last_mouth_ratio = -1.0
         self._lip_sync_thread = None
         mouth_param = self.find_param_by_usage(SpecialUsage.MOUTH_OPEN)
         if mouth_param:
@@ -817,6 +1314,12 @@ class EmoteWidget(QWebEngineView):
         self.mouth_param_info = mouth_param
 
         lip_sync_config = self.config['lip_sync']
+        # 曲线指数/过饱和系数在一次同步会话内不变，预计算查表省掉每帧的 pow
+        self._curve_lut = np.clip(
+            (np.linspace(0.0, 1.0, 256, dtype=np.float32) ** lip_sync_config['mouth_ratio_curve'])
+            * lip_sync_config['mouth_ratio_oversaturation'],
+            0.0, 1.0
+        )
         self._lip_sync_thread = StreamLipSyncThread(
             audio_queue,
             mean_decay_time=lip_sync_config['mean_decay_time_s'],
@@ -827,6 +1330,8 @@ class EmoteWidget(QWebEngineView):
         self._lip_sync_thread.mouth_open_ratio_updated.connect(self._on_mouth_ratio_update)
         self._lip_sync_thread.debug_data_updated.connect(self._monitor_widget.update_data)
         self._lip_sync_thread.finished.connect(self._reset_mouth_on_sync_finish)
+        self._pending_mouth_ratio = None
+        self._mouth_dispatch_timer.start()
         self._lip_sync_thread.start()
 
 
@@ -837,8 +1342,11 @@ class EmoteWidget(QWebEngineView):
         它在内部创建队列，并启动文件到流的转换器线程。
         """
         self.stop_lip_sync()
-        self._streamer_stop_event.clear()
-        audio_stream_queue = queue.Queue()
+        # 换一个全新的停止事件而不是清掉旧的：上一个会话的线程多半还阻塞在
+        # stream.write() 里，清位会让它错过停止信号继续播完整个文件，
+        # 和新会话交错写同一个持久化输出流
+        self._streamer_stop_event = threading.Event()
+        audio_stream_queue = AudioChunkQueue(maxlen=32)
         self.start_lip_sync(audio_stream_queue)
         logger.info(f"{filepath}启动同步，{audio_stream_queue}")
         self.stream_audio_file(filepath, audio_stream_queue)
@@ -1061,19 +1569,44 @@ class EmoteWidget(QWebEngineView):
         if image_filename is None:
             image_url = None
         else:
-            base_dir = os.path.dirname(__file__)
-            bg_path = os.path.abspath(os.path.join(
-                base_dir, 'web_frontend', 'backgrounds', image_filename
-            ))
-
-            if not os.path.exists(bg_path):
-                logger.warning(f"背景图片未找到: {bg_path}")
+            image_url, exists = _resolve_bg_url(image_filename)
+            if not exists:
+                logger.warning(f"背景图片未找到: {os.path.join(_BG_DIR, image_filename)}")
                 return
-            image_url = QUrl.fromLocalFile(bg_path).toString()
         
         # 将最终的 URL (或 None) 传递给控制器
         self._controller.set_background_image(image_url)
 
+    def set_background(self, r: int, g: int, b: int, a: float, image_filename: str | None = None):
+        """
+        一次调用同时设置背景颜色和背景图片。
+
+        与分别调用 set_background_color() 和 set_background_image() 等价，
+        但两条语句合并为一次 JS 执行，只有一趟桥往返、一次重绘。
+
+        参数:
+            r (int): 红色分量 (0-255)。
+            g (int): 绿色分量 (0-255)。
+            b (int): 蓝色分量 (0-255)。
+            a (float): 透明度 (0.0 - 1.0)。
+            image_filename (str | None, optional):
+                背景图片文件名；传入 `None` 表示移除背景图片。
+
+        示例:
+            # 换成深灰纯色背景（同时移除背景图）
+            widget.set_background(51, 51, 51, 1.0, image_filename=None)
+        """
+        if not self._controller:
+            return
+        if image_filename is None:
+            image_url = None
+        else:
+            image_url, exists = _resolve_bg_url(image_filename)
+            if not exists:
+                logger.warning(f"背景图片未找到: {os.path.join(_BG_DIR, image_filename)}")
+                return
+        self._controller.set_background(r, g, b, a, image_url)
+
     def set_grayscale(self, intensity: float, duration_ms: int = 0):
         """
         设置模型的灰度（黑白）效果。
@@ -1214,15 +1747,13 @@ class EmoteWidget(QWebEngineView):
         返回:
             list[str]: 所有可用特殊标签的字符串列表。
         """
-        # 使用 Python 的内省机制动态地从 BoundParams.SpecialUsage 类获取所有标签
-        return [
-            getattr(BoundParams.SpecialUsage, attr) 
-            for attr in dir(BoundParams.SpecialUsage) 
-            if not attr.startswith('__')
-        ]
+        # 标签列表在模块导入时已内省完毕；返回副本，防止调用方就地修改
+        return list(_SPECIAL_USAGE_TAGS)
 
     # --- 7. 底层参数控制 (Advanced) ---
 
+    @Slot(str, float)
+    @Slot(str, float, int)
     def set_variable(self, name: str, value: float, duration_ms: int = 0):
         """
         直接设置模型的一个底层变量的值。
@@ -1257,7 +1788,7 @@ class EmoteWidget(QWebEngineView):
             enable (bool): True 为开启，False 为关闭。
         """
         # 此方法直接操作 JS，无需等待控制器就绪
-        js_bool = json.dumps(enable) 
+        js_bool = 'true' if enable else 'false'
         self.page().runJavaScript(f"enablePlayerDrag({js_bool});")
 
     def enable_zoom(self, enable: bool):
@@ -1268,7 +1799,7 @@ class EmoteWidget(QWebEngineView):
             enable (bool): True 为开启，False 为关闭。
         """
         # 此方法直接操作 JS，无需等待控制器就绪
-        js_bool = json.dumps(enable)
+        js_bool = 'true' if enable else 'false'
         self.page().runJavaScript(f"enablePlayerZoom({js_bool});")
 
     def enable_gaze_control(self, enable: bool):
@@ -1276,58 +1807,149 @@ class EmoteWidget(QWebEngineView):
         开启或关闭模型的视线跟随鼠标功能 (数据驱动版)。
         """
         
-        head_lr_param = self.find_param_by_usage(SpecialUsage.HEAD_LR)
-        head_ud_param = self.find_param_by_usage(SpecialUsage.HEAD_UD)
-        eye_lr_param = self.find_param_by_usage(SpecialUsage.EYE_LR)
-        eye_ud_param = self.find_param_by_usage(SpecialUsage.EYE_UD)
+        # 四个参数在一次模型会话内不变，序列化结果随用途反查表一起缓存/失效
+        if self._gaze_params_json is None:
+            head_lr_param = self.find_param_by_usage(SpecialUsage.HEAD_LR)
+            head_ud_param = self.find_param_by_usage(SpecialUsage.HEAD_UD)
+            eye_lr_param = self.find_param_by_usage(SpecialUsage.EYE_LR)
+            eye_ud_param = self.find_param_by_usage(SpecialUsage.EYE_UD)
+
+            if not all([head_lr_param, head_ud_param, eye_lr_param, eye_ud_param]):
+                logger.warning("视线跟随警告 - 缺少必要的 HEAD_LR/UD 或 EYE_LR/UD 特殊标签。")
+                return
 
-        if not all([head_lr_param, head_ud_param, eye_lr_param, eye_ud_param]):
-            logger.warning("视线跟随警告 - 缺少必要的 HEAD_LR/UD 或 EYE_LR/UD 特殊标签。")
-            return
-            
-        gaze_params = {
-            "head_lr": head_lr_param,
-            "head_ud": head_ud_param,
-            "eye_lr": eye_lr_param,
-            "eye_ud": eye_ud_param,
-        }
-        
-        params_json = json.dumps(gaze_params)
-        js_code = f"enableGazeControl({str(enable).lower()}, {params_json});"
+            self._gaze_params_json = _json_dumps({
+                "head_lr": head_lr_param,
+                "head_ud": head_ud_param,
+                "eye_lr": eye_lr_param,
+                "eye_ud": eye_ud_param,
+            })
+
+        js_code = f"enableGazeControl({'true' if enable else 'false'}, {self._gaze_params_json});"
         self.page().runJavaScript(js_code)
     
     # --- 工具函数 ---
+    def _acquire_output_stream(self, samplerate: int, channels: int):
+        """
+        取得可写的持久化输出流。
+
+        PortAudio 打开设备（尤其 WASAPI/CoreAudio）可能耗时 50-200ms 并吞掉
+        开头的若干采样；这里跨播放复用同一个流，只在采样率/声道数变化时重开。
+        """
+        with self._out_stream_lock:
+            if (self._out_stream is not None
+                    and self._out_stream_params == (samplerate, channels)):
+                if self._out_stream.stopped:
+                    self._out_stream.start()
+                return self._out_stream
+
+            if self._out_stream is not None:
+                try:
+                    self._out_stream.stop()
+                    self._out_stream.close()
+                except Exception:
+                    logger.warning("关闭旧输出流时出错。", exc_info=True)
+
+            self._out_stream = sd.RawOutputStream(
+                samplerate=samplerate, channels=channels, dtype='float32'
+            )
+            self._out_stream.start()
+            self._out_stream_params = (samplerate, channels)
+            return self._out_stream
+
     def stream_audio_file(self, filepath: str, audio_queue: queue.Queue):
         """
         在一个新的可中止的线程中读取 .wav 文件，同时播放它并将其数据块放入队列。
         """
         blocksize_hz = self.config['file_streaming']['blocksize_hz']
+        batch_blocks = max(1, int(self.config['file_streaming'].get('queue_batch_blocks', 3)))
+        # 在调度线程里就把本会话的停止事件绑进闭包：之后新会话替换
+        # self._streamer_stop_event 也影响不到这个已经发出去的任务
+        stop_event = self._streamer_stop_event
         def thread_target():
             logger.info(f"文件流: 开始读取和播放 '{os.path.basename(filepath)}'...")
             try:
                 with sf.SoundFile(filepath, 'r') as audio_file:
                     samplerate, channels = audio_file.samplerate, audio_file.channels
                     blocksize = int(samplerate / blocksize_hz)
-                    
-                    with sd.OutputStream(samplerate=samplerate, channels=channels) as stream:
-                        while not self._streamer_stop_event.is_set():
-                            audio_chunk = audio_file.read(blocksize, dtype='float32')
-                            if len(audio_chunk) == 0:
-                                break # 文件结束
-                            
-                            stream.write(audio_chunk)
-                            mono_chunk = audio_chunk.mean(axis=1) if channels > 1 else audio_chunk
-                            audio_queue.put(mono_chunk)
+
+                    # 复用一小池缓冲：入队的是池中缓冲的切片视图，
+                    # 消费者用完归还，稳态下每块音频不再产生新分配。
+                    # 每块缓冲能装 batch_blocks 个原始块，攒满一批才入队一次
+                    pool = _AudioBufferPool(8, blocksize * channels * batch_blocks)
+                    if self._lip_sync_thread is not None:
+                        self._lip_sync_thread.buffer_pool = pool
+
+                    # 读缓冲同样整个会话只分配一次，read(out=...) 直接往里解码
+                    read_buf = np.empty((blocksize, channels), dtype=np.float32)
+
+                    # RawOutputStream 直接吃缓冲区字节，跳过 OutputStream.write
+                    # 里把 NumPy 数组转换/复制成中间缓冲的那一步；
+                    # 流本身是持久化的，免去每个文件一次的设备冷启动
+                    stream = self._acquire_output_stream(samplerate, channels)
+
+                    # 当前批次缓冲及已写入的样本数
+                    batch_buf = None
+                    batch_filled = 0
+                    batch_count = 0
+
+                    # 热循环里用到的绑定方法提前取成局部名，
+                    # 省掉每块一次的属性查找链（CPython 紧循环的经典小抠）
+                    stop_is_set = stop_event.is_set
+                    q_put = audio_queue.put
+                    sd_write = stream.write
+                    acquire = pool.acquire
+                    copyto = np.copyto
+
+                    # blocks() 在 libsndfile 层直接产出定长块（复用同一块 out
+                    # 缓冲），比手写 read + 空块判断的循环少一层 Python 开销。
+                    # blocksize 与 out 互斥，块长由 len(read_buf) 推断
+                    for audio_chunk in audio_file.blocks(dtype='float32',
+                                                         always_2d=True, out=read_buf):
+                        if stop_is_set():
+                            break
+                        n = len(audio_chunk)
+
+                        # 先攒批入队、再播放：stream.write 阻塞期间 GIL 已被
+                        # C 层释放，消费者线程正好趁这段时间分析刚入队的批。
+                        # 不再做单声道下混：分析端只算 RMS，交错立体声样本的
+                        # RMS 与下混后的只差一个常数因子，自适应 EMA 会吸收掉
+                        if batch_buf is None:
+                            batch_buf = acquire()
+                            batch_filled = 0
+                            batch_count = 0
+                        samples = n * channels
+                        chunk_view = batch_buf[batch_filled:batch_filled + samples]
+                        copyto(chunk_view, audio_chunk.reshape(-1))
+                        batch_filled += samples
+                        batch_count += 1
+
+                        # 攒满一批（或遇到尾部的短块）才唤醒一次消费者
+                        if batch_count >= batch_blocks or n < blocksize:
+                            q_put(batch_buf[:batch_filled])
+                            batch_buf = None
+
+                        # read(out=) 的返回视图是 C 连续的，memoryview 零拷贝进 PortAudio
+                        sd_write(memoryview(audio_chunk))
+
+                    # 文件读尽但最后一批未攒满时，把余量补发出去
+                    if batch_buf is not None and batch_filled > 0:
+                        audio_queue.put(batch_buf[:batch_filled])
             except Exception as e:
                 logger.error(f"文件流错误", exc_info=True)
             finally:
                 audio_queue.put(None) # 确保消费者线程也能结束
-                if self._streamer_stop_event.is_set():
+                if stop_event.is_set():
                     logger.info("文件流被外部指令中止。")
                 else:
                     logger.info("文件流正常结束。")
 
-        threading.Thread(target=thread_target, daemon=True).start()
+        if _GIL_ENABLED:
+            self._streamer_pool.start(_FnRunnable(thread_target))
+        else:
+            # 无 GIL 构建下直接开原生线程，绕开线程池两个工作位的串行化，
+            # 让重叠的播放请求真正并行跑
+            threading.Thread(target=thread_target, daemon=True).start()
 
     def show_lip_sync_monitor(self, show: bool, as_window: bool = True):
         """
@@ -1368,14 +1990,13 @@ class _FreeMoteInternalController:
     def __init__(self, js_executor):
         self._execute_js = js_executor
         self.js_player_name = "emotePlayer"
-
-    def _safe_run(self, js_code):
-        js_to_execute = f"""
+        # 包装样板只构造一次；热路径上 _safe_run 只做一次字符串拼接
+        wrapper = f"""
         (() => {{
             const player = {self.js_player_name};
             if (player && player.initialized) {{
                 try {{
-                    {js_code}
+                    @BODY@
                 }} catch (e) {{
                     // 将错误信息发送回 Python
                     if (window.py_api && window.py_api.on_js_error) {{
@@ -1387,7 +2008,31 @@ class _FreeMoteInternalController:
             }}
         }})();
     """
-        self._execute_js(js_to_execute)
+        self._safe_run_prefix, self._safe_run_suffix = wrapper.split("@BODY@")
+        # 轻量包装前缀：只保留 player 就绪判断
+        self._safe_run_light_prefix = (
+            f'if({self.js_player_name}&&{self.js_player_name}.initialized){{'
+        )
+        # 大体积查询结果（如 variableList）的 JSON 解析送回线程池时用的信使
+        self._parse_dispatcher = _ParsedResultDispatcher()
+
+    def _safe_run(self, js_code):
+        self._execute_js(self._safe_run_prefix + js_code + self._safe_run_suffix)
+
+    def _safe_run_light(self, js_code):
+        """
+        轻量包装：只做 player 就绪判断，不带 IIFE 和 try/catch。
+        仅用于属性赋值 / 简单 setter 这类不会跑进模型侧用户代码的语句，
+        每次调用省掉约 200 字节的样板 IPC 传输。
+        """
+        self._execute_js(self._safe_run_light_prefix + js_code + '}')
+
+    def _safe_run_batch(self, statements):
+        """
+        把多条语句合进同一个 _safe_run 包装，整串只跨一次到渲染进程的 IPC。
+        所有语句共享一个 try/catch，语义与逐条 _safe_run 一致。
+        """
+        self._safe_run('\n                    '.join(statements))
 
     def _safe_query(self, js_code, callback):
         js_to_execute = f"""
@@ -1409,55 +2054,74 @@ class _FreeMoteInternalController:
             if json_string is None:
                 callback(None)
                 return
+            if len(json_string) > 4096:
+                # 大载荷丢给线程池解析，不在 WebEngine 回调里卡主线程；
+                # 结果经 dispatcher 的队列连接送回主线程再执行回调
+                dispatcher = self._parse_dispatcher
+                def parse_job():
+                    try:
+                        data = _json_loads(json_string)
+                    except ValueError:
+                        logger.error(f"无法解析从JS返回的JSON: {json_string[:200]}...")
+                        data = None
+                    dispatcher.parsed.emit(callback, data)
+                QThreadPool.globalInstance().start(_FnRunnable(parse_job))
+                return
             try:
-                data = json.loads(json_string)
+                data = _json_loads(json_string)
                 callback(data)
-            except json.JSONDecodeError:
+            except ValueError:
                 logger.error(f"无法解析从JS返回的JSON: {json_string[:200]}...")
                 callback(None)
         self._execute_js(js_to_execute, json_parsing_wrapper)
 
     # --- 1. 基本模型操作 ---
     def show(self):
-        self._safe_run(f'{self.js_player_name}.hide = false;')
+        self._safe_run_light(f'{self.js_player_name}.hide = false;')
     def hide(self):
-        self._safe_run(f'{self.js_player_name}.hide = true;')
+        self._safe_run_light(f'{self.js_player_name}.hide = true;')
     def auto_center(self, duration_ms):
         self._safe_run(f'autoCenterPlayer({duration_ms});')
 
     # --- 2. 变换与位置 (Transform) ---
     def set_coord(self, x, y, duration_ms):
-        self._safe_run(f'{self.js_player_name}.setCoord({x}, {y}, {duration_ms});')
+        self._safe_run_light(f'{self.js_player_name}.setCoord({x}, {y}, {duration_ms});')
     def set_scale(self, scale, duration_ms):
-        self._safe_run(f'{self.js_player_name}.setScale({scale}, {duration_ms});')
+        self._safe_run_light(f'{self.js_player_name}.setScale({scale}, {duration_ms});')
     def set_rotation(self, angle_deg, duration_ms):
-        angle_rad = angle_deg * (3.14159 / 180.0)
-        self._safe_run(f'{self.js_player_name}.setRot({angle_rad}, {duration_ms});')
+        self._safe_run_light(f'{self.js_player_name}.setRot({math.radians(angle_deg)}, {duration_ms});')
 
     # --- 3. 动画控制 (Animation) ---
     def play(self, timeline_name):
-        safe_name = json.dumps(timeline_name)
+        safe_name = _json_dumps(timeline_name)
         self._safe_run(f'{self.js_player_name}.mainTimelineLabel = {safe_name};')
     def animation_reset(self, duration_ms: int, init_anim_name: str | None):
-        self.stop_all_timelines()
-        self.set_coord(0, 0, duration_ms)
-        self.set_scale(1.0, duration_ms)
-        self.set_rotation(0, duration_ms)
-        self.set_global_alpha(1.0, duration_ms)
-        self.set_grayscale(0.0, duration_ms)
-        self.set_vertex_color("#808080FF", 300)
-        self.set_physics_scale(1.0, 1.0, 1.0)
-        self.set_wind(0, 0, 0)
+        # 十来条重置指令拼成一个批次，只跨一次进程边界
+        p = self.js_player_name
+        statements = [
+            f'{p}.stopTimeline();',
+            f'{p}.setCoord(0, 0, {duration_ms});',
+            f'{p}.setScale(1.0, {duration_ms});',
+            f'{p}.setRot(0, {duration_ms});',
+            f'{p}.setGlobalAlpha(1.0, {duration_ms});',
+            f'{p}.setGrayscale(0.0, {duration_ms});',
+            f'{p}.setVertexColor("#808080FF", 300);',
+            f'{p}.hairScale = 1.0;',
+            f'{p}.partsScale = 1.0;',
+            f'{p}.bustScale = 1.0;',
+            f'{p}.windSpeed = 0; {p}.windPowMin = 0; {p}.windPowMax = 0;',
+        ]
         if init_anim_name:
             logger.info(f"Python 指令: 播放初始化动画 '{init_anim_name}'。")
-            self.play(init_anim_name)
+            statements.append(f'{p}.mainTimelineLabel = {_json_dumps(init_anim_name)};')
+        self._safe_run_batch(statements)
         logger.info("Python 指令: 完成模型状态重置。")
     def set_diff_timeline(self, slot, timeline_name):
         if not 1 <= slot <= 6: raise ValueError("Slot must be between 1 and 6.")
-        safe_name = json.dumps(timeline_name)
-        self._safe_run(f'{self.js_player_name}.diffTimelineSlot{slot} = {safe_name};')
+        safe_name = _json_dumps(timeline_name)
+        self._safe_run_light(f'{self.js_player_name}.diffTimelineSlot{slot} = {safe_name};')
     def set_speed(self, speed_ratio):
-        self._safe_run(f'{self.js_player_name}.speed = {speed_ratio};')
+        self._safe_run_light(f'{self.js_player_name}.speed = {speed_ratio};')
     def stop_all_timelines(self):
         self._safe_run(f'{self.js_player_name}.stopTimeline();')
 
@@ -1465,12 +2129,16 @@ class _FreeMoteInternalController:
     def set_background_color(self, r, g, b, a):
         self._execute_js(f"setBackgroundColor({r}, {g}, {b}, {a});")
     def set_background_image(self, image_url: str | None):
-        safe_url = json.dumps(image_url)
+        safe_url = _json_dumps(image_url)
         self._execute_js(f"setBackgroundImage({safe_url});")
+    def set_background(self, r, g, b, a, image_url=None):
+        # 颜色 + 图片合并成一段脚本，一次 runJavaScript 搞定
+        safe_url = _json_dumps(image_url)
+        self._execute_js(f"setBackgroundColor({r}, {g}, {b}, {a}); setBackgroundImage({safe_url});")
     def show_character_dialog(self, text, duration_ms, theme, y_offset, type_speed, anchor_marker):
-        safe_text = json.dumps(text)
-        safe_theme = json.dumps(theme)
-        safe_anchor = json.dumps(anchor_marker)
+        safe_text = _json_dumps(text)
+        safe_theme = _json_dumps(theme)
+        safe_anchor = _json_dumps(anchor_marker)
         js_code = f'showCharacterDialog({safe_text}, {duration_ms}, {safe_theme}, {y_offset}, {type_speed}, {safe_anchor});'
 
         logger.debug("已触发show_character_dialog")
@@ -1483,16 +2151,19 @@ class _FreeMoteInternalController:
         value = max(0.0, min(float(alpha), 1.0))
         self._safe_run(f'{self.js_player_name}.setGlobalAlpha({value}, {duration_ms});')
     def set_vertex_color(self, color_hex, duration_ms):
-        safe_color = json.dumps(color_hex)
+        safe_color = _json_dumps(color_hex)
         self._safe_run(f'{self.js_player_name}.setVertexColor({safe_color}, {duration_ms});')
 
     # --- 5. 物理与环境 (Physics & Environment) ---
     def set_physics_scale(self, hair, parts, bust):
-        self._safe_run(f'{self.js_player_name}.hairScale = {hair};')
-        self._safe_run(f'{self.js_player_name}.partsScale = {parts};')
-        self._safe_run(f'{self.js_player_name}.bustScale = {bust};')
+        # 三个属性赋值合成一次调用，不再做三趟 IPC
+        self._safe_run_light(
+            f'{self.js_player_name}.hairScale = {hair}; '
+            f'{self.js_player_name}.partsScale = {parts}; '
+            f'{self.js_player_name}.bustScale = {bust};'
+        )
     def set_wind(self, speed, power_min, power_max):
-        self._safe_run(f'{self.js_player_name}.windSpeed = {speed}; {self.js_player_name}.windPowMin = {power_min}; {self.js_player_name}.windPowMax = {power_max};')
+        self._safe_run_light(f'{self.js_player_name}.windSpeed = {speed}; {self.js_player_name}.windPowMin = {power_min}; {self.js_player_name}.windPowMax = {power_max};')
 
     # --- 6. 数据查询 (Data Query) ---
     def get_main_timelines(self, callback):
@@ -1502,13 +2173,13 @@ class _FreeMoteInternalController:
     def get_variables(self, callback):
         self._safe_query(f'{self.js_player_name}.variableList', callback)
     def get_marker_position(self, marker_name, callback):
-        safe_name = json.dumps(marker_name)
+        safe_name = _json_dumps(marker_name)
         self._safe_query(f'{self.js_player_name}.getMarkerPosition({safe_name})', callback)
 
     # --- 7. 底层参数控制 (Advanced) ---
     def set_variable(self, name, value, duration_ms):
-        safe_name = json.dumps(name)
+        safe_name = _json_dumps(name)
         self._safe_run(f'{self.js_player_name}.setVariable({safe_name}, {value}, {duration_ms});')
     def get_variable(self, name, callback):
-        safe_name = json.dumps(name)
+        safe_name = _json_dumps(name)
         self._safe_query(f'{self.js_player_name}.getVariable({safe_name})', callback)
\ No newline at end of file
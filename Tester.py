@@ -3,7 +3,9 @@ import os
 import json
 import logging
 import random
-from PySide6.QtCore import Qt, Slot, Signal, QTimer, QEvent
+import itertools
+from PySide6.QtCore import (Qt, Slot, Signal, QTimer, QSignalBlocker, QObject,
+                            QRunnable, QThreadPool)
 from PySide6.QtGui import QStandardItemModel, QStandardItem
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                                QHBoxLayout, QPushButton, QSlider, QLabel, QComboBox, 
@@ -11,11 +13,49 @@ from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                                QTabWidget, QDoubleSpinBox, QFileDialog, QSpinBox)
 from Emote_Widget import EmoteWidget as EmoteWidget
 
+# orjson 可选：把大变量字典序列化成带缩进的 JSON 时比标准库快数倍
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+def _pretty_dump(variables) -> str:
+    """把变量列表序列化成带缩进的 JSON 字符串，优先走 orjson。"""
+    if _orjson is not None:
+        return _orjson.dumps(
+            variables, option=_orjson.OPT_INDENT_2 | _orjson.OPT_NON_STR_KEYS
+        ).decode('utf-8')
+    return json.dumps(variables, indent=2, ensure_ascii=False)
+
 logging.basicConfig(
     level=logging.DEBUG,  # 设置根日志记录器捕获 DEBUG 及以上级别的所有日志
     format='%(asctime)s - %(name)s - [%(levelname)s] - %(message)s',
     datefmt='%Y-%m-%d %H:%M:%S'
 )
+
+# 脚本目录只在导入时解析一次，扫描资源时不必反复 dirname(__file__)
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 仅 Windows 需要把反斜杠归一成 '/'；POSIX 上直接原样返回，
+# 省掉每个文件一次无效 replace 带来的字符串分配
+if os.sep == '\\':
+    def _to_posix_path(p):
+        return p.replace('\\', '/')
+else:
+    def _to_posix_path(p):
+        return p
+
+# 滑块都是 [0, 500] 以内的整数刻度，value/100.0 直接查表，
+# 拖动时每个事件省一次除法和 int->float 转换
+_SCALE_LUT = tuple(i / 100.0 for i in range(0, 501))
+
+# QtWebEngine 启动参数是常量，拼好一次放模块级
+_CHROMIUM_FLAGS = " ".join((
+    "--remote-allow-origins=*",
+    "--disable-features=ProcessSharing",
+    "--incognito",
+    "--bwsi",
+))
  
 class CheckableComboBox(QComboBox):
     """ 
@@ -29,18 +69,35 @@ class CheckableComboBox(QComboBox):
         self.lineEdit().setReadOnly(True)
         model = QStandardItemModel(self)
         self.setModel(model)
-        self.view().viewport().installEventFilter(self)
-        self.model().dataChanged.connect(self._update_text)
+        # 用列表视图的 pressed 信号做委托式点击处理，
+        # 不再给 viewport 装事件过滤器（过滤器会让每个鼠标事件都绕道 Python）
+        self.view().pressed.connect(self._toggle_item)
+        self.model().dataChanged.connect(self._on_model_data_changed)
 
         self._changed = False
+        # 选中项的增量缓存：避免每次 dataChanged 都全表扫描模型
+        self._checked_set = set()
+
+    def _on_model_data_changed(self, top_left, bottom_right, roles=()):
+        """dataChanged 只携带变化的行区间，按区间增量维护选中集合。"""
+        if roles and Qt.CheckStateRole not in roles:
+            return
+        model = self.model()
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            item = model.item(row)
+            if item.checkState() == Qt.Checked:
+                self._checked_set.add(item.text())
+            else:
+                self._checked_set.discard(item.text())
+        self._update_text()
 
-    def eventFilter(self, widget, event):
-        """事件过滤器，用于在点击复选框时保持下拉列表打开。"""
-        if event.type() == QEvent.MouseButtonRelease:
-            if self.view().isVisible():
-                self._changed = True
-                return True
-        return super().eventFilter(widget, event)
+    def _toggle_item(self, index):
+        """点击条目时翻转其勾选状态，并标记弹窗内容已变化。"""
+        item = self.model().itemFromIndex(index)
+        item.setCheckState(
+            Qt.Unchecked if item.checkState() == Qt.Checked else Qt.Checked
+        )
+        self._changed = True
 
     def hidePopup(self):
         """重写 hidePopup，在下拉列表关闭时发射信号。"""
@@ -52,54 +109,110 @@ class CheckableComboBox(QComboBox):
     def add_item(self, text, checked=False):
         """添加一个条目到下拉列表中。"""
         item = QStandardItem(text)
-        item.setFlags(Qt.ItemIsUserCheckable | Qt.ItemIsEnabled)
+        # 不给 ItemIsUserCheckable：复选框靠 CheckStateRole 数据照常绘制，
+        # 但委托不再处理点击，_toggle_item 成为唯一翻转入口，
+        # 避免点在复选框方块上时 press 翻转一次、委托又翻回去
+        item.setFlags(Qt.ItemIsEnabled)
         item.setData(Qt.Unchecked if not checked else Qt.Checked, Qt.CheckStateRole)
+        if checked:
+            self._checked_set.add(text)
         self.model().appendRow(item)
     
     def add_items(self, texts: list):
-        """批量添加条目。"""
+        """批量添加条目：一次 appendRows，只触发一轮模型通知。"""
+        items = []
         for text in texts:
-            self.add_item(text)
+            item = QStandardItem(text)
+            # 同 add_item：翻转只走 _toggle_item，不给委托处理点击的机会
+            item.setFlags(Qt.ItemIsEnabled)
+            item.setData(Qt.Unchecked, Qt.CheckStateRole)
+            items.append(item)
+
+        model = self.model()
+        model.blockSignals(True)
+        try:
+            model.invisibleRootItem().appendRows(items)
+        finally:
+            model.blockSignals(False)
+        self._update_text()
             
     def set_checked_items(self, items_to_check: list):
         """根据一个列表来设置哪些条目应该被选中。"""
+        wanted = set(items_to_check)
+        self._checked_set = set()
         for i in range(self.model().rowCount()):
             item = self.model().item(i)
-            if item.text() in items_to_check:
+            if item.text() in wanted:
                 item.setCheckState(Qt.Checked)
+                self._checked_set.add(item.text())
             else:
                 item.setCheckState(Qt.Unchecked)
         self._update_text()
 
     def checked_items(self) -> list:
         """返回所有被选中的条目的文本列表。"""
-        checked = []
-        for i in range(self.model().rowCount()):
-            item = self.model().item(i)
-            if item.checkState() == Qt.Checked:
-                checked.append(item.text())
-        return checked
+        return list(self._checked_set)
 
     def _update_text(self):
         """更新 QComboBox 的显示文本，以逗号分隔显示所有选中项。"""
-        checked = self.checked_items()
-        if checked:
-            self.lineEdit().setText(", ".join(checked))
+        if self._checked_set:
+            self.lineEdit().setText(", ".join(sorted(self._checked_set)))
         else:
             self.lineEdit().setText("")
 
 
+class _ResourceScanTask(QRunnable):
+    """把目录扫描丢进线程池跑，结果通过（自动排队的）信号回到 GUI 线程。"""
+
+    class _Signals(QObject):
+        finished = Signal(str, object)
+
+    def __init__(self, kind, scan_fn):
+        super().__init__()
+        self.setAutoDelete(True)
+        self.kind = kind
+        self._scan_fn = scan_fn
+        self.signals = self._Signals()
+
+    def run(self):
+        self.signals.finished.emit(self.kind, self._scan_fn())
+
+
+class _JsonDumpTask(QRunnable):
+    """在线程池里做 JSON 序列化，结果经排队信号回 GUI 线程贴进文本框。"""
+
+    class _Signals(QObject):
+        finished = Signal(str)
+
+    def __init__(self, variables):
+        super().__init__()
+        self.setAutoDelete(True)
+        self._variables = variables
+        self.signals = self._Signals()
+
+    def run(self):
+        self.signals.finished.emit(_pretty_dump(self._variables))
+
+
 class ParamControlWidget(QWidget):
     """
     用于控制单个模型变量的自定义控件行，具有优化的弹性布局和功能。
     """
     param_data_changed = Signal(str, dict)
+    slider_value_ready = Signal(str, float)
 
-    def __init__(self, friendly_name, param_data, all_categories, available_usage_tags: list, parent=None):
+    def __init__(self, friendly_name, param_data, all_categories, sorted_categories: list, available_usage_tags: list, parent=None):
         super().__init__(parent)
         self.friendly_name = friendly_name
         self.param_data = param_data.copy()
         self.all_categories = all_categories
+
+        # 拖动滑块每秒能发出上百个 valueChanged，每个都直达 JS 桥会把
+        # WebChannel 刷爆；这里用 16ms 单发定时器把突发合并到约 60Hz
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(16)
+        self._flush_timer.timeout.connect(self._flush_slider)
         
         main_layout = QHBoxLayout(self)
         main_layout.setContentsMargins(4, 5, 4, 5)
@@ -120,7 +233,8 @@ class ParamControlWidget(QWidget):
         
         self.category_combo = QComboBox()
         self.category_combo.setEditable(True)
-        self.category_combo.addItems(sorted(list(self.all_categories)))
+        # 排序结果由调用方算一次、所有行共享，省掉每行一次 O(K log K)
+        self.category_combo.addItems(sorted_categories)
 
         self.usage_combo = CheckableComboBox()
         self.usage_combo.add_items(available_usage_tags)
@@ -144,7 +258,8 @@ class ParamControlWidget(QWidget):
         main_layout.addWidget(self.usage_combo, stretch=3)
 
         self.update_ui_from_data()
-        
+
+        self.slider.valueChanged.connect(self._on_slider_moved)
         self.min_spinbox.valueChanged.connect(self._on_data_changed)
         self.max_spinbox.valueChanged.connect(self._on_data_changed)
         self.category_combo.currentTextChanged.connect(self._on_data_changed)
@@ -153,9 +268,10 @@ class ParamControlWidget(QWidget):
     def update_ui_from_data(self):
         """用 self.param_data 的内容更新 UI 控件。"""
         min_val, max_val = self.param_data.get('range', (-1.0, 1.0))
-        self.min_spinbox.blockSignals(True); self.max_spinbox.blockSignals(True)
-        self.min_spinbox.setValue(min_val); self.max_spinbox.setValue(max_val)
-        self.min_spinbox.blockSignals(False); self.max_spinbox.blockSignals(False)
+        # QSignalBlocker 是 RAII 式的：即便 setValue 抛异常也能解除屏蔽
+        with QSignalBlocker(self.min_spinbox), QSignalBlocker(self.max_spinbox):
+            self.min_spinbox.setValue(min_val)
+            self.max_spinbox.setValue(max_val)
         self.slider.setRange(0, 1000)
         
         current_value = self.param_data.get('value', (min_val + max_val) / 2)
@@ -164,21 +280,35 @@ class ParamControlWidget(QWidget):
             slider_pos = int(((current_value - min_val) / (max_val - min_val)) * 1000)
         self.slider.setValue(slider_pos)
 
-        self.category_combo.blockSignals(True)
-        self.category_combo.setCurrentText(self.param_data.get('category', '未分类'))
-        self.category_combo.blockSignals(False)
-        
-        self.usage_combo.blockSignals(True)
-        usages = self.param_data.get('special_usage', [])
-        self.usage_combo.set_checked_items(usages)
-        self.usage_combo.blockSignals(False)
+        with QSignalBlocker(self.category_combo):
+            self.category_combo.setCurrentText(self.param_data.get('category', '未分类'))
+
+        with QSignalBlocker(self.usage_combo):
+            usages = self.param_data.get('special_usage', [])
+            self.usage_combo.set_checked_items(usages)
+
+        self._recompute_range()
+
+    def _recompute_range(self):
+        """缓存 min/max/跨度，滑块每动一格不必再查询两个 QSpinBox。"""
+        self._min_val = self.min_spinbox.value()
+        self._max_val = self.max_spinbox.value()
+        self._extent = self._max_val - self._min_val
+
+    @Slot()
+    def _on_slider_moved(self):
+        """滑块每动一格只负责启动定时器，真正的取值在 _flush_slider 里做。"""
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    @Slot()
+    def _flush_slider(self):
+        """把这一帧内最后的滑块值发出去，中间值直接丢弃。"""
+        self.slider_value_ready.emit(self.param_data['name'], self.get_value_from_slider())
 
     def get_value_from_slider(self):
         """将滑块的整数值 (0-1000) 映射到当前的 min/max 范围。"""
-        min_val = self.min_spinbox.value()
-        max_val = self.max_spinbox.value()
-        slider_ratio = self.slider.value() / 1000.0
-        return min_val + (max_val - min_val) * slider_ratio
+        return self._min_val + self._extent * (self.slider.value() * 0.001)
 
     @Slot()
     def _on_data_changed(self):
@@ -188,10 +318,12 @@ class ParamControlWidget(QWidget):
             self.min_spinbox.setValue(max_val)
             min_val = max_val
         self.param_data['range'] = (min_val, max_val)
+        self._recompute_range()
         
         category_text = self.category_combo.currentText()
-        if category_text not in self.all_categories:
-            self.all_categories.add(category_text)
+        # all_categories 是所有行共享的同一个 set：add 本身幂等且 O(1)，
+        # 新分类会立刻对其他行可见，无需先做成员判断
+        self.all_categories.add(category_text)
         self.param_data['category'] = category_text
 
         self.param_data['special_usage'] = self.usage_combo.checked_items()
@@ -212,16 +344,53 @@ class TestMainWindow(QMainWindow):
         self.emote_view = EmoteWidget(self)
         main_layout.addWidget(self.emote_view, 2)
 
-        self.available_models = self._scan_for_resources(os.path.join('web_frontend', 'models'), ['.psb'])
-        self.available_backgrounds = self._scan_for_resources(os.path.join('web_frontend', 'backgrounds'), ['.png', '.jpg', '.jpeg', '.gif'])
-        self.available_dialog_themes = self._scan_for_resources(os.path.join('web_frontend', 'dialogs'), ['.html'])
-        self.available_dialog_themes = [os.path.splitext(theme)[0] for theme in self.available_dialog_themes]
+        # 目录扫描走线程池，窗口不必等三轮磁盘遍历才能显示；
+        # 结果回来后由 _on_resources_scanned 填充各下拉框
+        self.available_models = []
+        self.available_backgrounds = []
+        self.available_dialog_themes = []
+        self._page_loaded = False
+        self._initial_model_loaded = False
+        self._last_vars_json = None
+        self._last_marker_query = None
+        # 标记点查询结果缓存：模型不变时同名查询不必再过一次桥
+        self._marker_cache = {}
+        self._pending_marker_name = None
+        self._last_physics = None
+
+        scan_jobs = {
+            'models': (os.path.join('web_frontend', 'models'), ('.psb',)),
+            'backgrounds': (os.path.join('web_frontend', 'backgrounds'),
+                            ('.png', '.jpg', '.jpeg', '.gif')),
+            'dialogs': (os.path.join('web_frontend', 'dialogs'), ('.html',)),
+        }
+        task = _ResourceScanTask(
+            'all', lambda jobs=scan_jobs: self._scan_all_resources(jobs)
+        )
+        task.signals.finished.connect(self._on_resources_scanned)
+        QThreadPool.globalInstance().start(task)
 
+        # 变换/物理滑块拖动时每秒能发出上百个 valueChanged；
+        # 每组用一个 16ms 单发定时器把突发合并成约每帧一次桥调用
+        self._coord_timer = self._make_flush_timer(self._flush_coord)
+        self._scale_timer = self._make_flush_timer(self._flush_scale)
+        self._physics_timer = self._make_flush_timer(self._flush_physics)
 
         self.tabs = QTabWidget()
         self._create_all_control_tabs()
         main_layout.addWidget(self.tabs, 1)
 
+        # 复位目标在控件全部建好后解析一次，
+        # _reset_ui_to_defaults 不再每次做 f-string + getattr
+        self._reset_targets = (
+            (self.scale_slider_ref, 100), (self.rotation_slider_ref, 0),
+            (self.x_slider_ref, 0), (self.y_slider_ref, 0),
+            (self.speed_slider_ref, 100), (self.alpha_slider_ref, 100),
+            (self.grayscale_slider_ref, 0), (self.hair_slider_ref, 100),
+            (self.parts_slider_ref, 100), (self.bust_slider_ref, 100),
+            (self.wind_slider_ref, 0),
+        )
+
         self.emote_view.load_finished.connect(self._on_page_load)
         self.emote_view.player_ready.connect(self._on_player_ready)
         self.emote_view.plugins_load_finished.connect(self._populate_plugins_tab)
@@ -230,6 +399,13 @@ class TestMainWindow(QMainWindow):
         self.emote_view.on_character_clicked.connect(self.character_was_clicked)
         self.emote_view.on_character_hovered.connect(self.character_was_hovered)
 
+    def _make_flush_timer(self, flush_slot):
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.setInterval(16)
+        timer.timeout.connect(flush_slot)
+        return timer
+
     @Slot()
     def character_was_clicked(self):
         print("角色被点击了")
@@ -238,21 +414,70 @@ class TestMainWindow(QMainWindow):
     def character_was_hovered(self):
         print("角色被悬停超过1秒")
         
+    def _scan_all_resources(self, categories):
+        """一趟调用扫完所有资源类别，返回 {类别: 相对路径列表}。
+
+        各类别子树互不重叠，按类别子树各自递归；若只按扩展名在
+        web_frontend 根上分发，会把播放器自身的 .html 误收进对话框
+        主题，还会白白深入模型数据目录。
+        """
+        return {
+            kind: self._scan_for_resources(rel_dir, exts)
+            for kind, (rel_dir, exts) in categories.items()
+        }
+
+    @Slot(str, object)
+    def _on_resources_scanned(self, kind, resources):
+        """资源扫描完成，填充对应的下拉框。"""
+        if kind == 'all':
+            for sub_kind, sub_resources in resources.items():
+                self._on_resources_scanned(sub_kind, sub_resources)
+        elif kind == 'models':
+            self.available_models = resources
+            self.model_combo.addItems(resources)
+            # 扫描若晚于页面加载完成，补上首个模型的自动加载
+            if self._page_loaded and not self._initial_model_loaded:
+                self._load_first_model()
+        elif kind == 'backgrounds':
+            self.available_backgrounds = resources
+            self.bg_combo.addItems(resources)
+        elif kind == 'dialogs':
+            self.available_dialog_themes = [os.path.splitext(theme)[0] for theme in resources]
+            self.dialog_theme_combo.addItems(self.available_dialog_themes)
+
+    def _load_first_model(self):
+        if self.available_models:
+            self._initial_model_loaded = True
+            self.emote_view.load_model(self.available_models[0])
+        else:
+            print("错误: 在 'web_frontend/models' 目录中未找到任何 .psb 模型文件。")
+
     def _scan_for_resources(self, relative_dir, extensions):
         """通用资源扫描函数。"""
-        resources_dir = os.path.join(os.path.dirname(__file__), relative_dir)
-        found_resources = []
+        resources_dir = os.path.join(_MODULE_DIR, relative_dir)
         if not os.path.exists(resources_dir):
             print(f"警告: 资源目录 '{resources_dir}' 不存在。")
             return []
-        
-        for root, _, files in os.walk(resources_dir):
-            for file in files:
-                if any(file.lower().endswith(ext) for ext in extensions):
-                    full_path = os.path.join(root, file)
-                    relative_path = os.path.relpath(full_path, resources_dir)
-                    found_resources.append(relative_path.replace("\\", "/"))
-        
+
+        # 扩展名收进 frozenset：rpartition 切一刀 + 一次哈希查找，
+        # 比逐个 endswith 更省（扩展名都不含多重后缀，语义等价）
+        ext_set = frozenset(ext.lstrip('.').lower() for ext in extensions)
+        found_resources = []
+
+        # scandir 的 DirEntry 自带类型信息，比 os.walk 少一轮 stat
+        def _scan(dir_path):
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        _scan(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        _, dot, ext = entry.name.rpartition('.')
+                        if dot and ext.lower() in ext_set:
+                            relative_path = os.path.relpath(entry.path, resources_dir)
+                            found_resources.append(_to_posix_path(relative_path))
+
+        _scan(resources_dir)
+
         print(f"在 '{relative_dir}' 中扫描到 {len(found_resources)} 个资源: {found_resources}")
         return found_resources
 
@@ -285,8 +510,7 @@ class TestMainWindow(QMainWindow):
         layout = QVBoxLayout(group)
         
         model_layout = QHBoxLayout()
-        self.model_combo = QComboBox()
-        self.model_combo.addItems(self.available_models)
+        self.model_combo = QComboBox()  # 扫描结果回来后填充
         self.load_model_btn = QPushButton("加载模型")
         self.load_model_btn.clicked.connect(self._load_selected_model)
         model_layout.addWidget(QLabel("模型:"))
@@ -294,8 +518,7 @@ class TestMainWindow(QMainWindow):
         model_layout.addWidget(self.load_model_btn)
         
         bg_layout = QHBoxLayout()
-        self.bg_combo = QComboBox()
-        self.bg_combo.addItems(self.available_backgrounds)
+        self.bg_combo = QComboBox()  # 扫描结果回来后填充
         self.apply_bg_btn = QPushButton("应用背景")
         self.apply_bg_btn.clicked.connect(self._apply_selected_background)
         self.clear_bg_btn = QPushButton("清除背景")
@@ -336,6 +559,11 @@ class TestMainWindow(QMainWindow):
         layout.addLayout(self.rot_slider_layout)
         layout.addLayout(self.x_slider_layout)
         layout.addLayout(self.y_slider_layout)
+
+        # 松开滑块时立刻冲刷，最终值不必等 16ms 定时器到点
+        self.scale_slider_ref.sliderReleased.connect(self._flush_scale)
+        self.x_slider_ref.sliderReleased.connect(self._flush_coord)
+        self.y_slider_ref.sliderReleased.connect(self._flush_coord)
         return group
 
     def _create_animation_controls(self):
@@ -376,7 +604,8 @@ class TestMainWindow(QMainWindow):
         self.color_btn = QPushButton("切换顶点颜色 (红/绿/蓝/白)")
         self.color_btn.clicked.connect(self._toggle_vertex_color)
         self.vertex_colors = ["#FF3030", "#80FF80", "#8080FF", "#FFFFFF"]
-        self.current_color_index = 0
+        # 循环迭代器代替手写的 index % len 轮转
+        self._color_cycle = itertools.cycle(self.vertex_colors)
         
         layout.addLayout(self.alpha_slider_layout)
         layout.addLayout(self.gray_slider_layout)
@@ -394,6 +623,10 @@ class TestMainWindow(QMainWindow):
         layout.addLayout(self.parts_slider_layout)
         layout.addLayout(self.bust_slider_layout)
         layout.addLayout(self.wind_slider_layout)
+
+        self.hair_slider_ref.sliderReleased.connect(self._flush_physics)
+        self.parts_slider_ref.sliderReleased.connect(self._flush_physics)
+        self.bust_slider_ref.sliderReleased.connect(self._flush_physics)
         return group
 
     def _create_advanced_controls(self):
@@ -441,8 +674,7 @@ class TestMainWindow(QMainWindow):
         self.dialog_text_input.setPlaceholderText("在此输入对话框文本...")
         
         theme_layout = QHBoxLayout()
-        self.dialog_theme_combo = QComboBox()
-        self.dialog_theme_combo.addItems(self.available_dialog_themes)
+        self.dialog_theme_combo = QComboBox()  # 扫描结果回来后填充
         theme_layout.addWidget(QLabel("主题:"))
         theme_layout.addWidget(self.dialog_theme_combo)
 
@@ -513,16 +745,20 @@ class TestMainWindow(QMainWindow):
         btn_layout.addWidget(self.refresh_params_btn)
         btn_layout.addWidget(self.save_map_btn)
         
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
+        self.params_scroll_area = QScrollArea()
+        self.params_scroll_area.setWidgetResizable(True)
+        self._reset_params_container()
+
+        layout.addLayout(btn_layout)
+        layout.addWidget(self.params_scroll_area)
+        return group
+
+    def _reset_params_container(self):
+        """换上全新的容器；setWidget 会在 C++ 侧一次性删除旧容器及其所有子控件。"""
         self.params_container = QWidget()
         self.params_layout = QVBoxLayout(self.params_container)
         self.params_layout.setAlignment(Qt.AlignTop)
-        scroll_area.setWidget(self.params_container)
-        
-        layout.addLayout(btn_layout)
-        layout.addWidget(scroll_area)
-        return group
+        self.params_scroll_area.setWidget(self.params_container)
     
     def _create_plugins_tab(self):
         """创建“插件”标签页的UI。"""
@@ -533,19 +769,21 @@ class TestMainWindow(QMainWindow):
         info_label.setWordWrap(True)
         info_label.setStyleSheet("color: #888;")
 
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
+        self.plugins_scroll_area = QScrollArea()
+        self.plugins_scroll_area.setWidgetResizable(True)
+        self._reset_plugins_container()
+
+        main_layout.addWidget(info_label)
+        main_layout.addWidget(self.plugins_scroll_area)
 
+        return group
+
+    def _reset_plugins_container(self):
+        """同 _reset_params_container：整体换容器代替逐个 deleteLater。"""
         self.plugins_container = QWidget()
         self.plugins_layout = QVBoxLayout(self.plugins_container)
         self.plugins_layout.setAlignment(Qt.AlignTop)
-        
-        scroll_area.setWidget(self.plugins_container)
-        
-        main_layout.addWidget(info_label)
-        main_layout.addWidget(scroll_area)
-        
-        return group
+        self.plugins_scroll_area.setWidget(self.plugins_container)
 
     def _create_slider(self, internal_name, display_name, min_val, max_val, init_val, callback):
         layout = QHBoxLayout()
@@ -563,11 +801,15 @@ class TestMainWindow(QMainWindow):
     @Slot()
     def _populate_plugins_tab(self):
         """当插件加载完成后，遍历插件并将其UI添加到插件面板。"""
-        while self.plugins_layout.count():
-            child = self.plugins_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
+        self._reset_plugins_container()
+        # 批量增删期间挂起重绘，整批结束只触发一次布局/绘制
+        self.plugins_container.setUpdatesEnabled(False)
+        try:
+            self._rebuild_plugins_panel()
+        finally:
+            self.plugins_container.setUpdatesEnabled(True)
 
+    def _rebuild_plugins_panel(self):
         all_plugins = self.emote_view.plugins.get_all()
         if not all_plugins:
             self.plugins_layout.addWidget(QLabel("未发现任何插件。"))
@@ -613,10 +855,11 @@ class TestMainWindow(QMainWindow):
         print("主窗口: 页面加载完成，准备加载模型...")
         self.load_model_btn.setEnabled(True)
         #self.emote_view.set_background_color(51, 51, 51, 1.0)
+        self._page_loaded = True
+        # 模型列表可能还在后台扫描；若已就绪则立即加载首个模型，
+        # 否则由 _on_resources_scanned 在扫描完成时补做
         if self.available_models:
-            self.emote_view.load_model(self.available_models[0] )
-        else:
-            print("错误: 在 'web_frontend/models' 目录中未找到任何 .psb 模型文件。")
+            self._load_first_model()
 
     @Slot()
     def _on_plugins_loaded(self):
@@ -631,10 +874,14 @@ class TestMainWindow(QMainWindow):
     def _on_player_ready(self, timelines):
         """当模型加载并准备就绪后调用。"""
         print(f"主窗口: 模型 '{self.model_combo.currentText()}' 已就绪，收到主 timeline: {timelines}")
-        self.anim_combo.blockSignals(True)
-        self.anim_combo.clear()
-        self.anim_combo.addItems(timelines)
-        self.anim_combo.blockSignals(False)
+        with QSignalBlocker(self.anim_combo):
+            self.anim_combo.clear()
+            self.anim_combo.addItems(timelines)
+
+        # 换了模型，旧的标记点位置不再可信；去重挡板也要一起失效，
+        # 否则同名查询会被它在查缓存之前就拦下，标签停留在旧模型的结果
+        self._marker_cache.clear()
+        self._last_marker_query = None
         
         self.emote_view.auto_center()
         self.emote_view.get_diff_timelines(self._on_diff_timelines_received)
@@ -653,16 +900,24 @@ class TestMainWindow(QMainWindow):
         """
         当从模型异步获取到变量列表后，启动分批UI创建流程。
         """
-        while self.params_layout.count():
-            child = self.params_layout.takeAt(0)
-            if child.widget(): child.widget().deleteLater()
+        self._reset_params_container()
+        # 整个分批重建窗口内挂起重绘，最后一批完成时统一恢复
+        self.params_container.setUpdatesEnabled(False)
 
         if not variables_list:
             self.params_layout.addWidget(QLabel("未能从模型获取变量列表。"))
+            self.params_container.setUpdatesEnabled(True)
             return
         self.variables_to_process = iter(variables_list)
         self.current_map_snapshot = self.emote_view.variable_map.copy()
+        # 模型变量名 -> (易记名, 映射数据) 的反查表，批处理循环里 O(1) 直取
+        self._reverse_map = {
+            p_data['name']: (f_name, p_data)
+            for f_name, p_data in self.current_map_snapshot.items()
+            if isinstance(p_data, dict) and 'name' in p_data
+        }
         self.all_categories_snapshot = set(p.get('category', '未分类') for p in self.current_map_snapshot.values() if isinstance(p, dict))
+        self.sorted_categories_snapshot = sorted(self.all_categories_snapshot)
         self.available_tags_snapshot = self.emote_view.get_available_special_usage_tags()
         self.batch_size = 20
         QTimer.singleShot(0, self._process_widget_creation_batch)
@@ -676,17 +931,23 @@ class TestMainWindow(QMainWindow):
                 var_info = next(self.variables_to_process, None)
                 if var_info is None:
                     print("UI: 所有参数绑定控件均已创建完成。")
+                    self.params_container.setUpdatesEnabled(True)
                     return
 
                 model_var_name = var_info.get('label')
                 if not model_var_name: continue
-                friendly_name, param_data = "unmapped", {"name": model_var_name}
-                for f_name, p_data in self.current_map_snapshot.items():
-                    if isinstance(p_data, dict) and p_data.get('name') == model_var_name:
-                        friendly_name, param_data = f_name, p_data
-                        break
-                control_widget = ParamControlWidget(friendly_name, param_data, self.all_categories_snapshot, self.available_tags_snapshot)
-                control_widget.slider.valueChanged.connect(lambda _, w=control_widget: self.emote_view.set_variable(w.param_data['name'], w.get_value_from_slider()))
+                mapped = self._reverse_map.get(model_var_name)
+                if mapped is not None:
+                    friendly_name, param_data = mapped
+                else:
+                    friendly_name, param_data = "unmapped", {"name": model_var_name}
+                control_widget = ParamControlWidget(friendly_name, param_data, self.all_categories_snapshot,
+                                                    self.sorted_categories_snapshot, self.available_tags_snapshot)
+                # 排队连接：滑块事件处理器只负责发信号，set_variable 作为
+                # 真正的 Qt 槽在事件循环的下一轮执行，不拖慢拖动手感
+                control_widget.slider_value_ready.connect(
+                    self.emote_view.set_variable, Qt.QueuedConnection
+                )
                 control_widget.param_data_changed.connect(self._on_param_data_in_ui_changed)
                 
                 self.params_layout.addWidget(control_widget)
@@ -694,11 +955,14 @@ class TestMainWindow(QMainWindow):
 
         except Exception as e:
             print(f"UI: 创建参数控件时发生错误: {e}")
+            self.params_container.setUpdatesEnabled(True)
 
     @Slot(str, dict)
     def _on_param_data_in_ui_changed(self, friendly_name, new_data):
         """当UI上的参数数据被用户修改时，实时更新 emote_view.variable_map。"""
         self.emote_view.variable_map[friendly_name] = new_data
+        # special_usage 可能变了，让控件侧的用途反查表重建
+        self.emote_view.invalidate_usage_index()
     
     @Slot()
     def _start_file_lip_sync(self):
@@ -737,20 +1001,48 @@ class TestMainWindow(QMainWindow):
 
     def _on_variables_received(self, variables):
         print(f"主窗口: 收到 {len(variables)} 个变量")
-        pretty_json = json.dumps(variables, indent=2, ensure_ascii=False)
-        self.vars_text_edit.setText(pretty_json)
+        # 大变量字典的序列化放到线程池做，不阻塞 GUI 线程的绘制
+        task = _JsonDumpTask(variables)
+        task.signals.finished.connect(self._show_variables_json)
+        QThreadPool.globalInstance().start(task)
+
+    @Slot(str)
+    def _show_variables_json(self, pretty_json):
+        # 内容没变就不动 QTextDocument；setPlainText 也省掉富文本解析
+        if pretty_json == self._last_vars_json:
+            return
+        self._last_vars_json = pretty_json
+        self.vars_text_edit.setPlainText(pretty_json)
 
     def _get_marker_pos(self):
-        marker_name = self.marker_input.text()
-        if marker_name:
-            self.emote_view.get_marker_position(marker_name, self._on_marker_pos_received)
+        marker_name = self.marker_input.text().strip()
+        # 名称与上次一致就不再发一次异步桥查询，标签上还是上次的结果
+        if not marker_name or marker_name == self._last_marker_query:
+            return
+        self._last_marker_query = marker_name
+        cached = self._marker_cache.get(marker_name)
+        if cached is not None:
+            # 模型自上次查询以来没换过，直接用缓存结果
+            self._show_marker_pos(cached)
+            return
+        self._pending_marker_name = marker_name
+        self.emote_view.get_marker_position(marker_name, self._on_marker_pos_received)
 
     def _on_marker_pos_received(self, pos_data):
+        if pos_data and self._pending_marker_name:
+            # intern 让重复查询共享同一个键字符串
+            self._marker_cache[sys.intern(self._pending_marker_name)] = pos_data
+        self._pending_marker_name = None
+        self._show_marker_pos(pos_data)
+
+    def _show_marker_pos(self, pos_data):
         if pos_data:
             text = f"位置: x={pos_data.get('x', 'N/A')}, y={pos_data.get('y', 'N/A')}"
-            self.marker_result_label.setText(text)
         else:
-            self.marker_result_label.setText("位置: 未找到")
+            text = "位置: 未找到"
+        # 文本没变就不 setText，免得 QLabel 白白走一轮失效/重绘
+        if self.marker_result_label.text() != text:
+            self.marker_result_label.setText(text)
 
     def _play_selected_diff(self):
         diff_name = self.diff_combo.currentText()
@@ -758,65 +1050,86 @@ class TestMainWindow(QMainWindow):
             self.emote_view.set_diff_timeline(1, diff_name)
 
     def _toggle_vertex_color(self):
-        color = self.vertex_colors[self.current_color_index]
-        self.current_color_index = (self.current_color_index + 1) % len(self.vertex_colors)
-        self.emote_view.set_vertex_color(color, duration_ms=200)
+        self.emote_view.set_vertex_color(next(self._color_cycle), duration_ms=200)
 
     def _toggle_bg_color(self):
-        r, g, b = random.randint(30, 80), random.randint(30, 80), random.randint(30, 80)
-        self.emote_view.set_background_color(r, g, b, 1.0)
-        self.emote_view.set_background_image(None)
-
-    def _on_scale_change(self, value):
-        self.emote_view.set_scale(value / 100.0)
+        # 一次 getrandbits 切出三个 5 bit 通道再映射到 [30, 80)，
+        # 比三次 randint 少两轮 _randbelow + 范围校验
+        bits = random.getrandbits(15)
+        r = 30 + (bits & 0x1F) * 51 // 32
+        g = 30 + ((bits >> 5) & 0x1F) * 51 // 32
+        b = 30 + ((bits >> 10) & 0x1F) * 51 // 32
+        # 颜色 + 清图片走合并接口，一次桥调用、一次重绘
+        self.emote_view.set_background(r, g, b, 1.0, image_filename=None)
+
+    def _on_scale_change(self, _value=None):
+        # 只负责启动定时器；最终值在 _flush_* 里从滑块现读，中间值直接丢弃
+        if not self._scale_timer.isActive():
+            self._scale_timer.start()
+
+    def _flush_scale(self):
+        self._scale_timer.stop()
+        self.emote_view.set_scale(_SCALE_LUT[self.scale_slider_ref.value()])
 
     def _on_physics_change(self):
-        hair = self.hair_slider_ref.value() / 100.0
-        parts = self.parts_slider_ref.value() / 100.0
-        bust = self.bust_slider_ref.value() / 100.0
-        self.emote_view.set_physics_scale(hair, parts, bust)
+        if not self._physics_timer.isActive():
+            self._physics_timer.start()
+
+    def _flush_physics(self):
+        self._physics_timer.stop()
+        # 三个滑块一次性快照；和上次相同（比如空响的信号）就不过桥
+        key = (self.hair_slider_ref.value(),
+               self.parts_slider_ref.value(),
+               self.bust_slider_ref.value())
+        if key == self._last_physics:
+            return
+        self._last_physics = key
+        self.emote_view.set_physics_scale(
+            _SCALE_LUT[key[0]], _SCALE_LUT[key[1]], _SCALE_LUT[key[2]]
+        )
 
     def _on_coord_change(self, _=None):
+        if not self._coord_timer.isActive():
+            self._coord_timer.start()
+
+    def _flush_coord(self):
+        self._coord_timer.stop()
         x = self.x_slider_ref.value()
         y = self.y_slider_ref.value()
         self.emote_view.set_coord(x, y)
 
     def _reset_model_and_ui(self):
-        if not self.emote_view: return
-        init_name = self.init_anim_input.text()
-        self.emote_view.config["animation"]["initialization_name"] = init_name
-        
-        self.emote_view.animation_reset()
+        emote_view = self.emote_view
+        if not emote_view: return
+        init_name = self.init_anim_input.text().strip()
+        # 只有名字真的变了才写配置，反复点重置不会空惊动配置观察方
+        anim_cfg = emote_view.config["animation"]
+        if anim_cfg.get("initialization_name") != init_name:
+            anim_cfg["initialization_name"] = init_name
+
+        emote_view.animation_reset()
         print("UI: 重置所有控制滑块。")
         self._reset_ui_to_defaults()
 
     def _reset_ui_to_defaults(self):
-        sliders = ["scale", "rotation", "x", "y", "speed", "alpha", "grayscale", "hair", "parts", "bust", "wind"]
-        defaults = [100, 0, 0, 0, 100, 100, 0, 100, 100, 100, 0]
-        for name, value in zip(sliders, defaults):
-            slider = getattr(self, f"{name}_slider_ref", None)
-            if slider:
-                slider.blockSignals(True)
+        for slider, value in self._reset_targets:
+            with QSignalBlocker(slider):
                 slider.setValue(value)
-                slider.blockSignals(False)
+        self._last_physics = None
 
         self.drag_check.setChecked(False)
         self.zoom_check.setChecked(False)
         self.gaze_check.setChecked(False)
 
         self.vars_text_edit.clear()
+        self._last_vars_json = None
+        self._last_marker_query = None
         self.marker_result_label.setText("位置: (未查询)")
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
 
-    chromium_flags = (
-        f"--remote-allow-origins=* "
-        f"--disable-features=ProcessSharing "
-        f"--incognito "
-        f"--bwsi "
-    )
-    os.environ['QTWEBENGINE_CHROMIUM_FLAGS'] = chromium_flags
+    os.environ['QTWEBENGINE_CHROMIUM_FLAGS'] = _CHROMIUM_FLAGS
     os.environ["QTWEBENGINE_REMOTE_DEBUGGING"] = "8000"
     window = TestMainWindow()
     window.show()